@@ -5,6 +5,7 @@ AST parsing utilities to extract spec components.
 import ast
 import contextlib
 import doctest
+import functools
 import hashlib
 import inspect
 import linecache
@@ -14,6 +15,11 @@ from collections.abc import Callable
 from pathlib import Path
 from typing import Any, cast
 
+# DocTestParser holds no per-call state, so one instance serves every spec.
+_DOCTEST_PARSER = doctest.DocTestParser()
+
+_HYPOTHESIS_BLOCK_RE = re.compile(r"```hypothesis\n(.*?)\n```", re.IGNORECASE | re.DOTALL)
+
 
 class SpecExtractor:
     """Extract spec components from a function."""
@@ -123,21 +129,28 @@ class SpecExtractor:
         Returns:
             Docstring or empty string if none
         """
-        doc = inspect.getdoc(self.func)
-        return doc or ""
+        return self._docstring
+
+    @functools.cached_property
+    def _docstring(self) -> str:
+        # Shared by the doctest, hypothesis and to_dict extractors.
+        return inspect.getdoc(self.func) or ""
 
     def extract_hypothesis_blocks(self) -> list[str]:
         """Extract fenced hypothesis blocks from the docstring."""
 
+        return list(self._hypothesis_blocks)
+
+    @functools.cached_property
+    def _hypothesis_blocks(self) -> tuple[str, ...]:
         doc = self.extract_docstring()
         if not doc:
-            return []
+            return ()
 
-        pattern = re.compile(r"```hypothesis\n(.*?)\n```", re.IGNORECASE | re.DOTALL)
         blocks = []
-        for match in pattern.findall(doc):
+        for match in _HYPOTHESIS_BLOCK_RE.findall(doc):
             blocks.append(textwrap.dedent(match).strip())
-        return blocks
+        return tuple(blocks)
 
     def extract_body_before_handled(self) -> str:
         """
@@ -146,6 +159,11 @@ class SpecExtractor:
         Returns:
             Code string before yield/return VibesafeHandled()
         """
+        return self._body_before_handled
+
+    @functools.cached_property
+    def _body_before_handled(self) -> str:
+        # Scanned once; to_dict and extract_dependencies both need it.
         source_lines = self.source.split("\n")
 
         # Find the function definition line
@@ -218,16 +236,19 @@ class SpecExtractor:
         Returns:
             List of doctest Example objects
         """
+        return list(self._doctests)
+
+    @functools.cached_property
+    def _doctests(self) -> tuple[doctest.Example, ...]:
         docstring = self.extract_docstring()
-        if not docstring:
-            return []
+        if ">>>" not in docstring:
+            # No prompt means no examples; skip the parser's regex scan.
+            return ()
 
-        parser = doctest.DocTestParser()
         try:
-            examples = parser.get_examples(docstring)
-            return examples
+            return tuple(_DOCTEST_PARSER.get_examples(docstring))
         except Exception:
-            return []
+            return ()
 
     def extract_dependencies(self) -> dict[str, dict[str, str]]:
         """
@@ -478,6 +499,37 @@ class SpecExtractor:
         }
 
 
+def cached_extractor(func: Callable[..., Any]) -> SpecExtractor:
+    """
+    Return the shared SpecExtractor for a function, building it on first use.
+
+    Only the fields derived from the function's own source are memoized on the
+    extractor (docstring, body, doctests, hypothesis blocks). ``extract_dependencies``
+    still reads the module globals and dependency files on every call.
+
+    The extractor is kept on the function itself (like ``__vibesafe_source__``),
+    so it is freed together with the function.
+
+    Args:
+        func: Function to extract spec from
+
+    Returns:
+        SpecExtractor for ``func``
+    """
+    func_obj = cast(Any, func)
+    extractor = getattr(func_obj, "__vibesafe_extractor__", None)
+    # functools.wraps copies __dict__, so a wrapper may carry its wrapped function's.
+    if extractor is not None and extractor.func is func:
+        return extractor
+
+    extractor = SpecExtractor(func)
+    try:
+        func_obj.__vibesafe_extractor__ = extractor
+    except (AttributeError, TypeError):  # no writable __dict__
+        pass
+    return extractor
+
+
 def extract_spec(func: Callable[..., Any]) -> dict[str, Any]:
     """
     Convenience function to extract spec from a function.
@@ -22,16 +22,18 @@ from vibesafe.core import get_registry, get_unit
 from vibesafe.hashing import compute_dependency_digest, compute_spec_hash
 from vibesafe.mcp import MCPServer
 from vibesafe.runtime import update_index
-from vibesafe.testing import run_all_tests, test_unit
+from vibesafe.testing import run_all_tests, shutdown_sandbox, test_unit
 
 console = Console()
 
 
 @click.group()
 @click.version_option(version=__version__)
-def main() -> None:
+@click.pass_context
+def main(ctx: click.Context) -> None:
     """Vibesafe - AI-powered code generation with verifiable specs."""
-    pass
+    # Sandbox workers are reused within a command only.
+    ctx.call_on_close(shutdown_sandbox)
 
 
 @main.command()
@@ -416,7 +418,14 @@ def compile(
 
 @main.command()
 @click.option("--target", help="Specific unit ID to test")
-def test(target: str | None) -> None:
+@click.option(
+    "--workers",
+    type=click.IntRange(1, None),
+    default=1,
+    show_default=True,
+    help="Worker processes for checking all units (forked; serial on macOS and Windows).",
+)
+def test(target: str | None, workers: int) -> None:
     """
     Run tests for generated implementations.
 
@@ -437,7 +446,7 @@ def test(target: str | None) -> None:
             sys.exit(1)
     else:
         console.print("[bold]Testing all units...[/bold]\n")
-        results = run_all_tests()
+        results = run_all_tests(workers=workers)
 
         passed = sum(1 for r in results.values() if r.passed)
         failed = len(results) - passed
@@ -280,7 +280,8 @@ class CodeGenerator:
             raise VibesafeProviderError(f"Provider request failed: {exc}") from exc
         return self._clean_generated_code(generated)
 
-    def _clean_generated_code(self, code: str) -> str:
+    @staticmethod
+    def _clean_generated_code(code: str) -> str:
         """
         Clean generated code by removing markdown code blocks and extra whitespace.
 
@@ -292,12 +293,13 @@ class CodeGenerator:
         """
         lines = code.strip().split("\n")
 
-        # Find start of code block
+        # Find start of code block (plain replies have no fence to look for)
         start_idx = -1
-        for i, line in enumerate(lines):
-            if line.strip().startswith("```"):
-                start_idx = i
-                break
+        if "```" in code:
+            for i, line in enumerate(lines):
+                if line.strip().startswith("```"):
+                    start_idx = i
+                    break
 
         # If code block found
         if start_idx != -1:
@@ -14,6 +14,28 @@ else:
 
 from pydantic import BaseModel, Field, model_validator
 
+# config path -> (raw bytes, parsed TOML) of the last read
+_TOML_CACHE: dict[str, tuple[bytes, dict[str, Any]]] = {}
+
+
+def _read_toml(path: Path) -> dict[str, Any]:
+    """Parse a TOML file, reusing the last parse while its content is unchanged.
+
+    The file is small, so it is always read and compared byte for byte; only the
+    parse is skipped. Unlike an mtime check this cannot miss two quick same-size
+    edits. Models are always rebuilt from the returned data, so callers must not
+    mutate it.
+    """
+    raw = path.read_bytes()
+    cache_key = str(path)
+    cached = _TOML_CACHE.get(cache_key)
+    if cached is not None and cached[0] == raw:
+        return cached[1]
+
+    data = tomllib.loads(raw.decode())
+    _TOML_CACHE[cache_key] = (raw, data)
+    return data
+
 
 class ProviderConfig(BaseModel):
     """Configuration for an LLM provider."""
@@ -124,8 +146,7 @@ class VibesafeConfig(BaseModel):
             cls._apply_overrides(config, base_dir=Path.cwd())
             return config
 
-        with open(config_path, "rb") as f:
-            data = tomllib.load(f)
+        data = _read_toml(config_path)
 
         # Parse provider configs
         providers = {}
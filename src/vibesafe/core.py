@@ -11,7 +11,7 @@ import warnings
 from collections.abc import Callable
 from typing import Any, ParamSpec, TypeVar, cast, overload
 
-from vibesafe.ast_parser import extract_spec
+from vibesafe.ast_parser import cached_extractor
 from vibesafe.config import get_config, resolve_template_id
 from vibesafe.exceptions import VibesafeMissingDoctest
 
@@ -151,7 +151,9 @@ def _handle_execution(
     """
     from vibesafe.runtime import load_checkpoint
 
-    spec_meta = extract_spec(original_func)
+    # The shared extractor parses the spec source once; to_dict() still re-reads the
+    # dependencies, so edits to helpers keep showing up in the spec hash.
+    spec_meta = cached_extractor(original_func).to_dict()
     expected_spec_hash = _compute_spec_hash(unit_id, spec_meta)
 
     async def _run_async_impl(impl: Callable) -> Any:
@@ -14,7 +14,7 @@ from vibesafe import __version__
 from vibesafe.codegen import generate_for_unit
 from vibesafe.core import get_registry
 from vibesafe.runtime import update_index
-from vibesafe.testing import run_all_tests, test_unit
+from vibesafe.testing import run_all_tests, shutdown_sandbox, test_unit
 
 
 class MCPServer:
@@ -49,6 +49,15 @@ class MCPServer:
 
     def handle_request(self, request: dict[str, Any]) -> None:
         """Handle a single JSON-RPC request."""
+        try:
+            self._dispatch(request)
+        finally:
+            # Do not keep sandbox workers (and the environment they started with)
+            # alive between requests to this long-running server.
+            shutdown_sandbox()
+
+    def _dispatch(self, request: dict[str, Any]) -> None:
+        """Route a request to its handler."""
         request_id = request.get("id")
         method = request.get("method")
         params = request.get("params", {})
@@ -1,18 +1,38 @@
 """Testing utilities for generated implementations."""
 
+import atexit
+import contextlib
 import doctest
+import functools
+import hashlib
 import importlib.util
 import inspect
 import json
+import linecache
+import multiprocessing
 import os
+import pickle
+import shutil
 import subprocess
 import sys
+import tempfile
 import textwrap
+import threading
+from collections.abc import Generator, Iterator
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from io import StringIO
+from multiprocessing.context import BaseContext
 from pathlib import Path
-from typing import Any, cast
+from types import CodeType, ModuleType
+from typing import Any, NamedTuple, cast
 
-from vibesafe.ast_parser import extract_spec
-from vibesafe.config import get_config
+if sys.version_info >= (3, 11):
+    import tomllib
+else:
+    import tomli as tomllib
+
+from vibesafe.ast_parser import cached_extractor
+from vibesafe.config import SandboxConfig, VibesafeConfig, get_config
 from vibesafe.runtime import load_checkpoint
 
 
@@ -41,7 +61,21 @@ class TestResult:
         return f"TestResult(failed={self.failures}/{self.total}, errors={error_detail})"
 
 
-def test_checkpoint(checkpoint_dir: Path, unit_meta: dict[str, Any]) -> TestResult:
+class _UnitKey(NamedTuple):
+    """Identifiers derived from a unit's metadata, computed once per check."""
+
+    unit_id: str
+    func_name: str
+
+    @classmethod
+    def from_meta(cls, unit_meta: dict[str, Any]) -> "_UnitKey":
+        qualname = unit_meta["qualname"]
+        return cls(unit_meta["module"] + "/" + qualname, qualname.rpartition(".")[2])
+
+
+def test_checkpoint(
+    checkpoint_dir: Path, unit_meta: dict[str, Any], config: VibesafeConfig | None = None
+) -> TestResult:
     """
     Test a checkpoint implementation.
 
@@ -50,6 +84,7 @@ def test_checkpoint(checkpoint_dir: Path, unit_meta: dict[str, Any]) -> TestResu
     Args:
         checkpoint_dir: Path to checkpoint directory
         unit_meta: Unit metadata with original function
+        config: Configuration to use (defaults to the global config)
 
     Returns:
         TestResult
@@ -60,20 +95,50 @@ def test_checkpoint(checkpoint_dir: Path, unit_meta: dict[str, Any]) -> TestResu
 
     # Extract spec to get doctests and property tests
     func = unit_meta["func"]
-    spec = extract_spec(func)
+    spec = _check_spec(func)
+
+    config = config or get_config()
+    key = _UnitKey.from_meta(unit_meta)
+    _ensure_vibesafe_harness(key, unit_meta, spec, config)
+
+    cached = _cached_pass(impl_path, spec, config)
+    if cached is not None:
+        return cached
+
+    check_result = _run_checks(impl_path, key, spec, config)
+    if not check_result.passed:
+        return check_result
+
+    gate_errors = _run_quality_gates(impl_path, config)
+    if gate_errors:
+        return TestResult(
+            passed=False,
+            failures=len(gate_errors),
+            total=check_result.total,
+            errors=gate_errors,
+        )
+
+    _record_pass(impl_path, spec, config, check_result)
+    return check_result
+
+
+def _run_checks(
+    impl_path: Path,
+    key: _UnitKey,
+    spec: dict[str, Any],
+    config: VibesafeConfig | None = None,
+) -> TestResult:
+    """Run a unit's doctests and property blocks (sandboxed or inline), without gates."""
+
     doctests = spec["doctests"]
     hypothesis_blocks = spec.get("hypothesis_blocks", [])
 
-    unit_id = unit_meta["module"] + "/" + unit_meta["qualname"]
-    _ensure_vibesafe_harness(unit_id, unit_meta, spec)
-
-    config = get_config()
-    sandbox_cfg = config.sandbox
+    sandbox_cfg = (config or get_config()).sandbox
 
     total_tests = 0
 
     if sandbox_cfg.enabled:
-        sandbox_result = _run_sandbox_checks(unit_meta, spec, sandbox_cfg)
+        sandbox_result = _run_sandbox_checks(key, spec, sandbox_cfg, impl_path)
         total_tests += sandbox_result.total
         if not sandbox_result.passed:
             return sandbox_result
@@ -82,7 +147,7 @@ def test_checkpoint(checkpoint_dir: Path, unit_meta: dict[str, Any]) -> TestResu
         impl_func = None
         if doctests or hypothesis_blocks:
             try:
-                impl_func = _load_impl_func(impl_path, unit_meta)
+                impl_func = _load_impl_func(impl_path, key)
             except Exception as e:
                 return TestResult(passed=False, errors=[f"Failed to load implementation: {e}"])
 
@@ -94,7 +159,7 @@ def test_checkpoint(checkpoint_dir: Path, unit_meta: dict[str, Any]) -> TestResu
 
         if hypothesis_blocks and impl_func is not None:
             property_total, property_errors = _run_hypothesis_inline(
-                unit_id, impl_func, hypothesis_blocks
+                key.unit_id, impl_func, hypothesis_blocks
             )
             total_tests += property_total
             if property_errors:
@@ -105,36 +170,82 @@ def test_checkpoint(checkpoint_dir: Path, unit_meta: dict[str, Any]) -> TestResu
                     errors=property_errors,
                 )
 
-    gate_errors = _run_quality_gates(impl_path)
-    if gate_errors:
-        return TestResult(
-            passed=False,
-            failures=len(gate_errors),
-            total=total_tests,
-            errors=gate_errors,
-        )
-
     return TestResult(passed=True, failures=0, total=total_tests)
 
 
-def _load_impl_func(impl_path: Path, unit_meta: dict[str, Any]) -> Any:
-    """Load function from implementation file."""
-    unit_id = unit_meta["module"] + "/" + unit_meta["qualname"]
-    func_name = unit_meta["qualname"].split(".")[-1]
+def _check_spec(func: Any) -> dict[str, Any]:
+    """Return the parts of a spec that its checks read: docstring, doctests, properties.
+
+    These come from the spec function's own source, so the shared extractor
+    computes them once per function. Dependencies are left out on purpose: they
+    follow live module globals and files on disk, and checks never use them.
+    """
+
+    extractor = cached_extractor(func)
+    return {
+        "docstring": extractor.extract_docstring(),
+        "doctests": extractor.extract_doctests(),
+        "hypothesis_blocks": extractor.extract_hypothesis_blocks(),
+    }
 
-    spec = importlib.util.spec_from_file_location(
-        f"vibesafe._test.{unit_id.replace('/', '.')}", impl_path
-    )
-    if spec is None or spec.loader is None:
-        raise ImportError(f"Could not load spec from {impl_path}")
 
-    module = importlib.util.module_from_spec(spec)
-    spec.loader.exec_module(module)
+# impl path -> (mtime_ns, size, module) of the last load
+_IMPL_MODULE_CACHE: dict[str, tuple[int, int, ModuleType]] = {}
 
-    if not hasattr(module, func_name):
-        raise AttributeError(f"Function {func_name} not found in {impl_path}")
 
-    return getattr(module, func_name)
+def _load_impl_func(impl_path: Path, key: _UnitKey) -> Any:
+    """Load function from implementation file.
+
+    The executed module is reused while the file's mtime and size are unchanged, so
+    repeated test runs against the same checkpoint skip re-running its top level.
+    """
+    stat = impl_path.stat()
+    cache_key = str(impl_path)
+    cached = _IMPL_MODULE_CACHE.get(cache_key)
+    if cached is not None and cached[:2] == (stat.st_mtime_ns, stat.st_size):
+        module = cached[2]
+    else:
+        module_name = f"vibesafe._test.{key.unit_id.replace('/', '.')}"
+        spec = importlib.util.spec_from_file_location(module_name, impl_path)
+        if spec is None or spec.loader is None:
+            raise ImportError(f"Could not load spec from {impl_path}")
+
+        module = importlib.util.module_from_spec(spec)
+        # Registered before execution so the impl can resolve itself (dataclasses,
+        # pickling, typing.get_type_hints) like a normally imported module.
+        sys.modules[module_name] = module
+        try:
+            spec.loader.exec_module(module)
+        except BaseException:
+            sys.modules.pop(module_name, None)
+            raise
+        _IMPL_MODULE_CACHE[cache_key] = (stat.st_mtime_ns, stat.st_size, module)
+
+    if not hasattr(module, key.func_name):
+        raise AttributeError(f"Function {key.func_name} not found in {impl_path}")
+
+    return getattr(module, key.func_name)
+
+
+_DOCTEST_OPTIONFLAGS = doctest.ELLIPSIS | doctest.NORMALIZE_WHITESPACE
+_DOCTEST_RUNNER = doctest.DocTestRunner(optionflags=_DOCTEST_OPTIONFLAGS)
+_DOCTEST_RUNNER_LOCK = threading.Lock()
+
+
+@contextlib.contextmanager
+def _doctest_runner() -> Generator[doctest.DocTestRunner, None, None]:
+    """Yield the shared doctest runner, or a private one if it is already in use.
+
+    The runner swaps ``sys.stdout`` while examples execute, so it must never be
+    entered twice at once (another thread, or a unit that tests another unit).
+    """
+    if not _DOCTEST_RUNNER_LOCK.acquire(blocking=False):
+        yield doctest.DocTestRunner(optionflags=_DOCTEST_OPTIONFLAGS)
+        return
+    try:
+        yield _DOCTEST_RUNNER
+    finally:
+        _DOCTEST_RUNNER_LOCK.release()
 
 
 def _run_doctests(func: Any, docstring: str, examples: list[doctest.Example]) -> TestResult:
@@ -149,9 +260,6 @@ def _run_doctests(func: Any, docstring: str, examples: list[doctest.Example]) ->
     Returns:
         TestResult
     """
-    # Create a doctest runner
-    runner = doctest.DocTestRunner(optionflags=doctest.ELLIPSIS | doctest.NORMALIZE_WHITESPACE)
-
     # Create a DocTest object
     dt = doctest.DocTest(
         examples=examples,
@@ -163,10 +271,9 @@ def _run_doctests(func: Any, docstring: str, examples: list[doctest.Example]) ->
     )
 
     # Run tests with captured output for better feedback (silenced to avoid stdout noise)
-    from io import StringIO
-
     output = StringIO()
-    failures, total = runner.run(dt, clear_globs=False, out=output.write)
+    with _doctest_runner() as runner:
+        failures, total = runner.run(dt, clear_globs=False, out=output.write)
 
     # Collect errors
     errors = []
@@ -178,60 +285,326 @@ def _run_doctests(func: Any, docstring: str, examples: list[doctest.Example]) ->
     return TestResult(passed=(failures == 0), failures=failures, total=total, errors=errors)
 
 
-def _run_quality_gates(impl_path: Path) -> list[str]:
-    """Run lint and type-check gates against the generated implementation."""
+# Files the gate tools read their settings from, looked up from a checked file upwards.
+_GATE_CONFIG_FILES = ("pyproject.toml", "ruff.toml", ".ruff.toml", "ty.toml")
 
-    gates = [
-        ("ruff", ["ruff", "check", "--fix", "--unsafe-fixes", str(impl_path)]),
-        ("ty", ["ty", "check", str(impl_path)]),
-    ]
 
-    errors: list[str] = []
-    for name, cmd in gates:
+def _gate_config(start: Path) -> bytes:
+    """Return the contents of every gate config file from ``start`` up to the root."""
+
+    parts = []
+    for directory in (start, *start.parents):
+        for name in _GATE_CONFIG_FILES:
+            path = directory / name
+            try:
+                parts.extend((os.fsencode(path), path.read_bytes()))
+            except OSError:
+                continue
+    return b"\0".join(parts)
+
+
+def _gate_marker(impl_path: Path, config: VibesafeConfig) -> Path:
+    """Return the marker recording that this exact implementation passed all gates.
+
+    The key covers the file's content, the gate tools' versions and their config,
+    so upgrading ruff or ty or changing the lint settings re-runs the gates. Markers
+    live under ``paths.cache``: they are machine-local and never committed.
+    """
+
+    digest = hashlib.blake2b(impl_path.read_bytes(), digest_size=16)
+    for version in _gate_tool_versions():
+        digest.update(b"\0" + version.encode())
+    digest.update(b"\0" + _gate_config(impl_path.parent))
+    return config.resolve_path(config.paths.cache) / "gates" / f"{digest.hexdigest()}.ok"
+
+
+def _pass_record(impl_path: Path, config: VibesafeConfig) -> Path:
+    """Return where a checkpoint's recorded pass is kept.
+
+    Like the gate markers it lives under ``paths.cache``, one file per checkpoint:
+    its key depends on this machine's Python and tool versions, so it must stay out
+    of the committed checkpoint directory.
+    """
+
+    name = hashlib.blake2b(os.fsencode(impl_path.resolve()), digest_size=16).hexdigest()
+    return config.resolve_path(config.paths.cache) / "passes" / f"{name}.json"
+
+
+def _gate_tool_versions() -> tuple[str, ...]:
+    """Return the version strings of the gate tools currently on PATH."""
+
+    return tuple(_tool_version(name, _gate_executable(name)) for name, _ in _GATES)
+
+
+@functools.cache
+def _tool_version(name: str, executable: str) -> str:
+    """Return one gate tool's version, asked once per resolved executable."""
+
+    try:
+        proc = subprocess.run(
+            [name, "--version"],
+            executable=executable,
+            capture_output=True,
+            text=True,
+            check=False,
+            close_fds=False,
+        )
+    except FileNotFoundError:
+        return f"{name} missing"
+    return proc.stdout.strip()
+
+
+def _pass_key(impl_path: Path, spec: dict[str, Any], sandbox_cfg: SandboxConfig) -> str:
+    """Digest every input that decides whether a checkpoint passes its checks.
+
+    The sandbox settings are included, so a pass recorded in-process (or under a
+    looser memory or time limit) is not reused once the sandbox would check it.
+    """
+
+    digest = hashlib.blake2b(impl_path.read_bytes(), digest_size=16)
+    parts = (
+        spec.get("docstring", ""),
+        "\n\n".join(spec.get("hypothesis_blocks", [])),
+        sandbox_cfg.model_dump_json(),
+        sys.version,
+        *_gate_tool_versions(),
+    )
+    for part in parts:
+        digest.update(b"\0" + part.encode())
+    return digest.hexdigest()
+
+
+def _cached_pass(
+    impl_path: Path, spec: dict[str, Any], config: VibesafeConfig
+) -> TestResult | None:
+    """Return the recorded passing result if nothing it depended on has changed.
+
+    Besides its own key, the pass needs a current gate marker (see ``_gate_marker``),
+    so a change to the ruff or ty settings re-runs the gates.
+    """
+
+    try:
+        data = json.loads(_pass_record(impl_path, config).read_text())
+    except (OSError, ValueError):
+        return None
+    if not isinstance(data, dict) or data.get("key") != _pass_key(impl_path, spec, config.sandbox):
+        return None
+    if not _gate_marker(impl_path, config).exists():
+        return None
+    return TestResult(passed=True, failures=0, total=int(data.get("total", 0)))
+
+
+def _record_pass(
+    impl_path: Path, spec: dict[str, Any], config: VibesafeConfig, result: TestResult
+) -> None:
+    """Remember a pass so unchanged checkpoints skip their checks next time.
+
+    Only recorded once the quality gates really ran and passed on this exact
+    content (see ``_gate_marker``), never when they were unavailable.
+    """
+
+    if not _gate_marker(impl_path, config).exists():
+        return
+    record = {"key": _pass_key(impl_path, spec, config.sandbox), "total": result.total}
+    record_path = _pass_record(impl_path, config)
+    with contextlib.suppress(OSError):
+        record_path.parent.mkdir(parents=True, exist_ok=True)
+        record_path.write_text(json.dumps(record))
+
+
+_GATES: tuple[tuple[str, list[str]], ...] = (
+    ("ruff", ["ruff", "check", "--fix", "--unsafe-fixes", "--output-format=json"]),
+    ("ty", ["ty", "check", "--output-format=concise"]),
+)
+
+
+# (tool name, PATH) -> absolute path of the tool; failed lookups are not stored
+_GATE_EXECUTABLES: dict[tuple[str, str | None], str] = {}
+
+
+def _gate_executable(name: str) -> str:
+    """Resolve a gate tool on the current PATH, falling back to the bare name.
+
+    Spawning an absolute path skips the exec-time PATH search on every gate run.
+    Lookups are remembered per PATH value, so activating another environment in a
+    long-running process picks up its tools, and a missing tool is looked up again.
+    """
+
+    key = (name, os.environ.get("PATH"))
+    executable = _GATE_EXECUTABLES.get(key)
+    if executable is None:
+        executable = shutil.which(name)
+        if executable is None:
+            return name
+        _GATE_EXECUTABLES[key] = executable
+    return executable
+
+
+def _run_quality_gates(impl_path: Path, config: VibesafeConfig | None = None) -> list[str]:
+    """Run lint and type-check gates against the generated implementation.
+
+    Results are cached per implementation content: once every gate has passed, a
+    marker keyed by the file's hash is written under ``paths.cache`` and later runs
+    skip the subprocesses until the file, the tools or their config change.
+    """
+
+    return _run_quality_gates_batched([impl_path], config).get(impl_path, [])
+
+
+def _run_quality_gates_batched(
+    impl_paths: list[Path], config: VibesafeConfig | None = None
+) -> dict[Path, list[str]]:
+    """Run each gate once over many implementations and bucket failures per file.
+
+    Tool startup dominates on small generated files, so ``run_all_tests`` gates the
+    whole registry with one ``ruff`` and one ``ty`` invocation instead of two per unit.
+    Files that already passed (see ``_gate_marker``) are skipped entirely.
+    """
+
+    config = config or get_config()
+    pending = [path for path in impl_paths if not _gate_marker(path, config).exists()]
+    results: dict[Path, list[str]] = {path: [] for path in impl_paths}
+    if not pending:
+        return results
+
+    cwd = Path(os.path.commonpath([path.parent for path in pending]))
+    errors: dict[Path, list[str]] = {path: [] for path in pending}
+    missing: list[str] = []
+
+    for name, cmd in _GATES:
         try:
-            subprocess.run(
-                cmd,
-                cwd=impl_path.parent,
-                check=True,
+            completed = subprocess.run(
+                [*cmd, *(str(path) for path in pending)],
+                executable=_gate_executable(cmd[0]),
+                cwd=cwd,
                 capture_output=True,
                 text=True,
+                # fds are non-inheritable by default (PEP 446); skipping the
+                # close_fds sweep saves a walk of every open descriptor per spawn.
+                close_fds=False,
             )
         except FileNotFoundError:
             # Gate unavailable locally; skip but record informational notice.
-            errors.append(f"{name} not installed - install to enable full gating")
-        except subprocess.CalledProcessError as exc:
-            output = exc.stderr.strip() or exc.stdout.strip() or str(exc)
-            errors.append(f"{name} failed: {output}")
+            missing.append(name)
+            continue
+
+        if completed.returncode == 0:
+            continue
+
+        output = completed.stderr.strip() or completed.stdout.strip() or str(completed)
+        if name == "ruff":
+            per_path = _attribute_ruff_output(completed.stdout, pending)
+        else:
+            per_path = _attribute_lines(completed.stdout, pending, cwd)
+
+        for path in pending:
+            detail = per_path.get(path)
+            if detail:
+                errors[path].append(f"{name} failed: {detail}")
+            elif not any(per_path.values()):
+                # Nothing could be attributed to a file; fail the whole batch.
+                errors[path].append(f"{name} failed: {output}")
+
+    # If every gate is missing, treat as failure with a clear message.
+    if len(missing) == len(_GATES):
+        unavailable = ["Quality gates unavailable: install ruff and mypy to proceed"]
+        return {path: list(unavailable) if path in errors else [] for path in impl_paths}
+
+    for path, path_errors in errors.items():
+        results[path] = path_errors
+        if not path_errors and not missing:
+            # Key on the post-gate content, since ruff --fix may have rewritten the file.
+            marker = _gate_marker(path, config)
+            marker.parent.mkdir(parents=True, exist_ok=True)
+            marker.touch()
 
-    # Only treat missing tooling as error if all gates missing? spec probably expects gating available.
-    # If both gates missing, treat as failure but with clear message. Otherwise remove success entries.
-    missing = [e for e in errors if "not installed" in e]
-    if missing and len(missing) == len(gates):
-        return ["Quality gates unavailable: install ruff and mypy to proceed"]
+    return results
 
-    return [e for e in errors if "not installed" not in e]
+
+def _attribute_ruff_output(stdout: str, paths: list[Path]) -> dict[Path, str]:
+    """Group ruff's JSON diagnostics by the implementation file they belong to."""
+
+    try:
+        diagnostics = json.loads(stdout or "[]")
+    except json.JSONDecodeError:
+        return {}
+
+    by_name = {os.path.realpath(path): path for path in paths}
+    lines: dict[Path, list[str]] = {}
+    for diag in diagnostics:
+        path = by_name.get(os.path.realpath(diag.get("filename", "")))
+        if path is None:
+            continue
+        location = diag.get("location") or {}
+        lines.setdefault(path, []).append(
+            f"{path.name}:{location.get('row', 0)}:{location.get('column', 0)}: "
+            f"{diag.get('code') or 'error'} {diag.get('message', '')}"
+        )
+    return {path: "\n".join(entries) for path, entries in lines.items()}
+
+
+def _attribute_lines(stdout: str, paths: list[Path], cwd: Path) -> dict[Path, str]:
+    """Group ``file:line:col:`` diagnostics by the implementation file they name."""
+
+    prefixes = [
+        (prefix + ":", path) for path in paths for prefix in {str(path), os.path.relpath(path, cwd)}
+    ]
+    lines: dict[Path, list[str]] = {}
+    for line in stdout.splitlines():
+        for prefix, path in prefixes:
+            if line.startswith(prefix):
+                lines.setdefault(path, []).append(line)
+                break
+    return {path: "\n".join(entries) for path, entries in lines.items()}
+
+
+_SANITIZE_TABLE = str.maketrans({".": "_", "/": "_"})
 
 
 def _sanitize_unit_id(unit_id: str) -> str:
     """Convert a unit_id into a filesystem-friendly suffix."""
 
-    return unit_id.replace(".", "_").replace("/", "_")
+    return unit_id.translate(_SANITIZE_TABLE)
+
+
+class _UnitSpec(NamedTuple):
+    """Harness inputs for one unit, serialized into its module's test file."""
 
+    func_name: str
+    docstring: str
+    properties: str
+    source_path: str
+    # doctest.Example fields (source, want, exc_msg, lineno, indent, options), parsed
+    # here once so the harness never re-scans the docstring
+    examples: list[tuple[Any, ...]]
 
-_MODULE_TEST_SPECS: dict[str, dict[str, Any]] = {}
+
+def _example_fields(examples: list[doctest.Example]) -> list[tuple[Any, ...]]:
+    """Flatten parsed doctest examples into JSON-serializable field tuples."""
+
+    return [
+        (ex.source, ex.want, ex.exc_msg, ex.lineno, ex.indent, sorted(ex.options.items()))
+        for ex in examples
+    ]
+
+
+_MODULE_TEST_SPECS: dict[str, dict[str, _UnitSpec]] = {}
 
 
 def _ensure_vibesafe_harness(
-    unit_id: str, unit_meta: dict[str, Any], spec: dict[str, Any]
+    key: _UnitKey,
+    unit_meta: dict[str, Any],
+    spec: dict[str, Any],
+    config: VibesafeConfig | None = None,
 ) -> Path | None:
-    """Write aggregated pytest harness per source module.
+    """Write aggregated pytest harness cases per source module.
 
     - Only materializes in production mode.
-    - Groups multiple units from the same module into a single test file.
+    - Groups multiple units from the same module into a single cases file.
     - Expands doctest examples into pytest cases while preserving property blocks.
     """
 
-    config = get_config()
+    config = config or get_config()
     if config.project.env != "prod":
         return None
 
@@ -241,145 +614,293 @@ def _ensure_vibesafe_harness(
     module_name = unit_meta.get("module") or "unknown_module"
     module_entry = _MODULE_TEST_SPECS.setdefault(module_name, {})
 
-    module_entry[unit_id] = {
-        "func_name": unit_meta["qualname"].split(".")[-1],
-        "docstring": spec.get("docstring", ""),
-        "properties": "\n\n".join(spec.get("hypothesis_blocks", [])),
-        "source_path": inspect.getsourcefile(unit_meta["func"]) or module_name.replace(".", "/"),
-    }
+    module_entry[key.unit_id] = _UnitSpec(
+        func_name=key.func_name,
+        docstring=spec.get("docstring", ""),
+        properties="\n\n".join(spec.get("hypothesis_blocks", [])),
+        source_path=inspect.getsourcefile(unit_meta["func"]) or module_name.replace(".", "/"),
+        examples=_example_fields(spec["doctests"]),
+    )
 
     return _write_module_harness(module_name)
 
 
-def _write_module_harness(module_name: str) -> Path:
-    dest_dir = Path.cwd() / "tests" / "vibesafe"
-    dest_dir.mkdir(parents=True, exist_ok=True)
-
-    filename = f"test_{module_name.replace('.', '_')}.py"
-    harness_path = dest_dir / filename
-
-    cases = _MODULE_TEST_SPECS.get(module_name, {})
-    cases_literal = json.dumps(cases, ensure_ascii=False, indent=4)
+# Static runner shared by every module; per-module cases are plain JSON files.
+_HARNESS_RUNNER_NAME = "test_vibesafe_harness.py"
+_HARNESS_RUNNER = (
+    textwrap.dedent(
+        '''
+        """Auto-generated doctest/property harness for vibesafe units.
 
-    harness = (
-        textwrap.dedent(
-            f'''
-        """Auto-generated doctest/property harness for module {module_name}."""
+        Cases are read from the cases_<module>.json files next to this file, one per
+        source module; vibesafe rewrites only those JSON files as specs change.
+        """
 
         import doctest
+        import functools
+        import io
         import json
+        from pathlib import Path
+
         import pytest
         from vibesafe.runtime import load_checkpoint
 
-        MODULE_CASES = json.loads({cases_literal!r})
+
+        def _load_cases() -> dict:
+            cases: dict = {}
+            for path in sorted(Path(__file__).parent.glob("cases_*.json")):
+                cases.update(json.loads(path.read_text(encoding="utf-8")))
+            return cases
+
+
+        MODULE_CASES = _load_cases()
+        _PARSER = doctest.DocTestParser()
+        # One runner for every case; examples never re-enter the harness.
+        _RUNNER = doctest.DocTestRunner(optionflags=doctest.ELLIPSIS)
+
+
+        @functools.cache
+        def _load(unit_id: str):
+            # Reruns and repeated parametrization reuse the loaded implementation.
+            return load_checkpoint(unit_id)
 
 
         @pytest.mark.parametrize("unit_id", list(MODULE_CASES.keys()))
         def test_doctests_and_properties(unit_id: str) -> None:
             meta = MODULE_CASES[unit_id]
-            func = load_checkpoint(unit_id)
+            func = _load(unit_id)
 
             _run_doctests(unit_id, func, meta)
             _exec_properties(unit_id, func, meta)
 
 
+        def _examples(meta) -> list:
+            fields = meta.get("examples")
+            if fields is None:
+                # Cases written before examples were pre-parsed.
+                docstring = meta.get("docstring", "")
+                return _PARSER.get_examples(docstring) if ">>>" in docstring else []
+            return [
+                doctest.Example(source, want, exc_msg, lineno, indent, dict(options))
+                for source, want, exc_msg, lineno, indent, options in fields
+            ]
+
+
         def _run_doctests(unit_id: str, func, meta) -> None:
             docstring = meta.get("docstring", "")
             if not docstring:
                 return
-            parser = doctest.DocTestParser()
-            examples = parser.get_examples(docstring)
+            examples = _examples(meta)
             if not examples:
                 return
             test = doctest.DocTest(
                 examples=examples,
-                globs={{meta.get("func_name", "func"): func}},
+                globs={meta.get("func_name", "func"): func},
                 name=unit_id,
                 filename=meta.get("source_path", "<generated>"),
                 lineno=0,
                 docstring=docstring,
             )
-            runner = doctest.DocTestRunner(optionflags=doctest.ELLIPSIS)
-            failures, _ = runner.run(test, clear_globs=False)
+            report = io.StringIO()
+            failures, _ = _RUNNER.run(test, clear_globs=False, out=report.write)
             if failures:
-                raise AssertionError(f"{{failures}} doctest(s) failed for {{unit_id}}")
+                detail = report.getvalue().strip()
+                raise AssertionError(f"{failures} doctest(s) failed for {unit_id}:\\n{detail}")
 
 
         def _exec_properties(unit_id: str, func, meta) -> None:
             prop_src = meta.get("properties") or ""
             if not prop_src:
                 return
-            namespace = {{
+            namespace = {
                 "load_checkpoint": load_checkpoint,
                 "UNIT_ID": unit_id,
                 "FUNC_NAME": meta.get("func_name", "func"),
                 "func": func,
-            }}
+            }
             exec(prop_src, namespace)
             for value in list(namespace.values()):
                 if callable(value) and hasattr(value, "hypothesis"):
                     value()
         '''
-        ).strip()
-        + "\n"
-    )
+    ).strip()
+    + "\n"
+)
 
-    harness_path.write_text(harness)
-    return harness_path
+# Header of the per-module .py harnesses written by earlier versions.
+_LEGACY_HARNESS_HEADER = '"""Auto-generated doctest/property harness for module '
 
+# path -> (content digest, mtime_ns) of the last write from this process
+_HARNESS_WRITES: dict[Path, tuple[str, int]] = {}
 
-def _run_sandbox_checks(
-    unit_meta: dict[str, Any],
-    spec: dict[str, Any],
-    sandbox_cfg,
-) -> TestResult:
-    """Execute doctests/properties inside sandboxed subprocess."""
 
-    payload = {
-        "unit_id": unit_meta["module"] + "/" + unit_meta["qualname"],
-        "func_name": unit_meta["qualname"].split(".")[-1],
-        "docstring": spec.get("docstring", ""),
-        "properties": "\n\n".join(spec.get("hypothesis_blocks", [])),
-        "memory_limit": sandbox_cfg.memory_mb * 1024 * 1024 if sandbox_cfg.memory_mb else 0,
-    }
+# harness directories already created by this process
+_HARNESS_DIRS: set[Path] = set()
 
-    script = textwrap.dedent(
-        """
-        import doctest
-        import json
-        import os
-        import sys
 
+def _write_if_changed(path: Path, content: str) -> bool:
+    """Write ``content`` unless this process already wrote it and the file is untouched.
+
+    Unchanged files are detected from a remembered digest and mtime, never by
+    reading the file back. Writes go through a temporary file and ``os.replace``
+    so a concurrent pytest run never collects a half-written harness.
+
+    Returns:
+        True if the file was (re)written
+    """
+
+    digest = hashlib.blake2b(content.encode(), digest_size=16).hexdigest()
+    previous = _HARNESS_WRITES.get(path)
+    if previous is not None and previous[0] == digest:
         try:
-            from vibesafe.runtime import load_checkpoint
-        except Exception as exc:  # pragma: no cover
-            print(json.dumps({"error": f"Failed to import runtime: {exc}"}))
-            sys.exit(2)
+            if path.stat().st_mtime_ns == previous[1]:
+                return False
+        except OSError:
+            pass
+
+    if path.parent not in _HARNESS_DIRS:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        _HARNESS_DIRS.add(path.parent)
+    # A plain open() keeps the usual umask-derived mode, unlike tempfile's 0600.
+    tmp_path = path.with_name(f".{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+    try:
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            f.write(content)
+        os.replace(tmp_path, path)
+    except FileNotFoundError:
+        if path.parent.is_dir():
+            raise
+        # The directory was removed since we created it; recreate it and retry.
+        _HARNESS_DIRS.discard(path.parent)
+        return _write_if_changed(path, content)
+    except BaseException:
+        with contextlib.suppress(OSError):
+            tmp_path.unlink()
+        raise
+    _HARNESS_WRITES[path] = (digest, path.stat().st_mtime_ns)
+    return True
+
+
+def _write_module_harness(module_name: str) -> Path:
+    """Write the module's cases JSON (and the shared runner) under tests/vibesafe.
+
+    Returns:
+        Path to the module's cases file
+    """
+
+    dest_dir = Path.cwd() / "tests" / "vibesafe"
+    _write_if_changed(dest_dir / _HARNESS_RUNNER_NAME, _HARNESS_RUNNER)
+
+    sanitized = module_name.translate(_SANITIZE_TABLE)
+    cases_path = dest_dir / f"cases_{sanitized}.json"
+    cases = {
+        unit_id: unit_spec._asdict()
+        for unit_id, unit_spec in _MODULE_TEST_SPECS.get(module_name, {}).items()
+    }
+    if not _write_if_changed(cases_path, json.dumps(cases, ensure_ascii=False, indent=4) + "\n"):
+        return cases_path
+
+    # A per-module harness from an earlier version would run these cases twice.
+    legacy_path = dest_dir / f"test_{sanitized}.py"
+    try:
+        with open(legacy_path, encoding="utf-8") as f:
+            is_legacy = f.readline().startswith(_LEGACY_HARNESS_HEADER)
+    except OSError:
+        is_legacy = False
+    if is_legacy:
+        legacy_path.unlink()
+
+    return cases_path
+
 
-        data = json.loads(os.environ["VIBESAFE_SANDBOX"])
+_SANDBOX_WORKER_SRC = textwrap.dedent(
+    """
+    import doctest
+    import functools
+    import io
+    import json
+    import linecache
+    import os
+    import pickle
+    import sys
+
+    # Requests are pickles on stdin, written by the trusted parent. Results go back
+    # as JSON lines on a private copy of the original stdout, and fd 1 itself is
+    # pointed at stderr: whatever checked code writes, even through os.write, never
+    # reaches the result channel, and nothing the parent reads can run code there.
+    requests = sys.stdin.buffer
+    channel = os.fdopen(os.dup(1), "w", encoding="utf-8")
+    os.dup2(2, 1)
+
+    def emit(result):
+        channel.write(json.dumps(result) + "\\n")
+        channel.flush()
+
+    memory_limit = int(sys.argv[1]) if len(sys.argv) > 1 else 0
+    if memory_limit:
+        try:  # pragma: no cover - platform dependent
+            import resource
+
+            resource.setrlimit(resource.RLIMIT_AS, (memory_limit, memory_limit))
+        except Exception:
+            pass
+
+    try:
+        from vibesafe.config import get_config
+        from vibesafe.runtime import load_checkpoint
+    except Exception as exc:  # pragma: no cover
+        emit({"error": f"Failed to import runtime: {exc}"})
+        sys.exit(2)
+
+    # Request timeouts only start once the interpreter is up and vibesafe imported.
+    emit({"ready": True})
+
+    # The worker outlives many requests; parse each distinct docstring once.
+    parser = doctest.DocTestParser()
+
+    @functools.lru_cache(maxsize=256)
+    def examples_for(docstring):
+        return parser.get_examples(docstring)
 
-        memory_limit = data.get("memory_limit", 0)
-        if memory_limit:
-            try:  # pragma: no cover - platform dependent
-                import resource
+    # Same stable filenames as in-process runs, so property source stays retrievable.
+    @functools.lru_cache(maxsize=256)
+    def compile_properties(sanitized, source):
+        filename = "<vibesafe-properties:" + sanitized + ">"
+        linecache.cache[filename] = (len(source), None, source.splitlines(True), filename)
+        return compile(source, filename, "exec")
 
-                resource.setrlimit(resource.RLIMIT_AS, (memory_limit, memory_limit))
-            except Exception:
-                pass
+    # unit_id -> ((impl path, mtime_ns, size), func) of the last load; an edited or
+    # re-pointed impl changes the key and is loaded afresh.
+    loaded = {}
 
+    def load(unit_id, impl_path):
+        try:
+            stat = os.stat(impl_path) if impl_path else None
+        except OSError:
+            stat = None
+        if stat is None:
+            return load_checkpoint(unit_id)
+
+        key = (impl_path, stat.st_mtime_ns, stat.st_size)
+        cached = loaded.get(unit_id)
+        if cached is not None and cached[0] == key:
+            return cached[1]
+        func = load_checkpoint(unit_id)
+        loaded[unit_id] = (key, func)
+        return func
+
+    def check(data):
         result = {"failures": [], "total": 0}
 
         try:
-            func = load_checkpoint(data["unit_id"])
+            func = load(data["unit_id"], data.get("impl_path"))
         except Exception as exc:
             result["failures"].append(f"Failed to load implementation: {exc}")
-            print(json.dumps(result))
-            sys.exit(1)
+            return result
 
         docstring = data.get("docstring", "")
-        if docstring:
-            parser = doctest.DocTestParser()
-            examples = parser.get_examples(docstring)
+        if ">>>" in docstring:
+            examples = examples_for(docstring)
             if examples:
                 dt = doctest.DocTest(
                     examples=examples,
@@ -390,21 +911,24 @@ def _run_sandbox_checks(
                     docstring=docstring,
                 )
                 runner = doctest.DocTestRunner(optionflags=doctest.ELLIPSIS)
-                failures, total = runner.run(dt, clear_globs=False)
+                report = io.StringIO()
+                failures, total = runner.run(dt, clear_globs=False, out=report.write)
                 result["total"] += total
                 if failures:
-                    result["failures"].append(f"{failures} doctest(s) failed")
+                    detail = report.getvalue().strip()
+                    result["failures"].append(f"{failures} doctest(s) failed: {detail}")
 
         prop_src = data.get("properties", "")
         if prop_src:
             namespace = {
+                "__name__": "vibesafe._props." + data["sanitized"],
                 "load_checkpoint": load_checkpoint,
                 "UNIT_ID": data["unit_id"],
                 "FUNC_NAME": data["func_name"],
                 "func": func,
             }
             try:
-                exec(prop_src, namespace)
+                exec(compile_properties(data["sanitized"], prop_src), namespace)
                 for value in list(namespace.values()):
                     if callable(value) and hasattr(value, "hypothesis"):
                         result["total"] += 1
@@ -417,59 +941,380 @@ def _run_sandbox_checks(
             except Exception as exc:
                 result["failures"].append(f"Hypothesis block execution failed: {exc}")
 
-        print(json.dumps(result))
-        sys.exit(0 if not result["failures"] else 1)
-        """
-    )
+        return result
 
-    env = os.environ.copy()
-    env["VIBESAFE_SANDBOX"] = json.dumps(payload)
+    def serve(data):
+        captured = io.StringIO()
+        sys.stdout = sys.stderr = captured
+        try:
+            return check(data)
+        except BaseException as exc:
+            return {"failures": [f"Sandbox execution failed: {exc!r}"], "total": 0}
+        finally:
+            sys.stdout, sys.stderr = sys.__stdout__, sys.__stderr__
 
-    timeout = sandbox_cfg.timeout if sandbox_cfg.timeout else None
+    while True:
+        try:
+            data = pickle.load(requests)
+        except EOFError:
+            break
+
+        # Pick up index/mode changes made by the parent since the last request.
+        get_config(reload=True)
+        # A list is a batch of units answered with one list of results.
+        if isinstance(data, list):
+            emit([serve(item) for item in data])
+        else:
+            emit(serve(data))
+    """
+)
 
-    try:
-        completed = subprocess.run(
-            [sys.executable, "-c", script],
-            env=env,
-            capture_output=True,
-            text=True,
-            timeout=timeout,
+
+# Upper bound on starting a worker interpreter and importing vibesafe in it.
+_SANDBOX_STARTUP_TIMEOUT = 60.0
+
+
+class _SandboxWorker:
+    """Long-lived sandbox interpreter that serves one check request at a time.
+
+    Starting a fresh interpreter and importing vibesafe dominates the cost of a
+    sandboxed check, so a worker is reused while the working directory and memory
+    limit stay the same. Each thread has its own worker (see ``_request_sandbox``).
+
+    A reused worker keeps state between requests: every implementation module it
+    loaded stays in ``sys.modules``, module globals persist, and all of it counts
+    against ``RLIMIT_AS``. With a memory limit the worker is therefore pinned to a
+    single unit (``unit_id``), so one unit's allocations never decide whether the
+    next one fits. Without a limit one worker serves every unit.
+
+    The worker's stderr goes to a temporary file rather than a pipe, so a chatty
+    child can never block on it; its tail is reported if the worker dies.
+    """
+
+    def __init__(self, cwd: str, memory_limit: int, unit_id: str | None = None):
+        self.cwd = cwd
+        self.memory_limit = memory_limit
+        self.unit_id = unit_id
+        self.ready = False
+        self.stderr = tempfile.TemporaryFile()  # noqa: SIM115 - closed in close()
+        try:
+            self.process = subprocess.Popen(
+                [sys.executable, "-c", _SANDBOX_WORKER_SRC, str(memory_limit)],
+                stdin=subprocess.PIPE,
+                stdout=subprocess.PIPE,
+                stderr=self.stderr,
+                cwd=cwd,
+                close_fds=False,  # see _run_quality_gates_batched
+            )
+        except BaseException:
+            self.stderr.close()
+            raise
+
+    def matches(self, cwd: str, memory_limit: int, unit_id: str | None = None) -> bool:
+        return (
+            self.process.poll() is None
+            and self.cwd == cwd
+            and self.memory_limit == memory_limit
+            and self.unit_id == unit_id
         )
-    except subprocess.TimeoutExpired:
-        return TestResult(passed=False, failures=1, total=0, errors=["Sandbox timed out"])
 
-    stdout = (completed.stdout or "").strip()
-    stderr = (completed.stderr or "").strip()
+    def stderr_tail(self, limit: int = 4000) -> str:
+        """Return the last ``limit`` bytes the worker wrote to stderr, decoded."""
 
-    try:
-        data = json.loads(stdout or "{}")
-    except json.JSONDecodeError:
-        message = "Sandbox returned invalid output"
+        try:
+            size = self.stderr.seek(0, os.SEEK_END)
+            self.stderr.seek(max(size - limit, 0))
+            return self.stderr.read().decode(errors="replace").strip()
+        except (OSError, ValueError):
+            return ""
+
+    def run(self, payload: Any, timeout: float | None) -> Any:
+        """Send one request and wait for its result.
+
+        The result is decoded JSON and is not trusted: callers check its shape
+        (see ``_sandbox_result``) before using it.
+
+        Raises:
+            subprocess.TimeoutExpired: If no result arrives within ``timeout``; the
+                worker is killed and must be discarded.
+        """
+
+        stdin = cast(Any, self.process.stdin)
+
+        try:
+            pickle.dump(payload, stdin, protocol=pickle.HIGHEST_PROTOCOL)
+            stdin.flush()
+        except (OSError, ValueError):
+            pass  # Worker already exited (broken pipe); whatever it wrote is read below.
+
+        if not self.ready:
+            # Interpreter start-up is not charged to the first request's timeout.
+            greeting = self._receive(_SANDBOX_STARTUP_TIMEOUT)
+            if not isinstance(greeting, dict) or greeting.get("ready") is not True:
+                if isinstance(greeting, dict) and greeting.get("error"):
+                    return greeting
+                self.process.kill()
+                return {"error": "Sandbox worker failed to start"}
+            self.ready = True
+
+        return self._receive(timeout)
+
+    def _receive(self, timeout: float | None) -> Any:
+        """Read the worker's next JSON line, killing it if none arrives in time."""
+
+        stdout = cast(Any, self.process.stdout)
+        timed_out = threading.Event()
+
+        def _expire() -> None:
+            timed_out.set()
+            self.process.kill()
+
+        timer = threading.Timer(timeout, _expire) if timeout else None
+        if timer is not None:
+            timer.daemon = True
+            timer.start()
+        try:
+            line = stdout.readline()
+        except (OSError, ValueError):
+            line = b""
+        finally:
+            if timer is not None:
+                timer.cancel()
+
+        if line:
+            try:
+                return json.loads(line)
+            except ValueError:
+                # The channel is out of step; the worker cannot be trusted any more.
+                self.process.kill()
+                return {"error": "Sandbox worker sent a malformed result"}
+
+        if timed_out.is_set():
+            raise subprocess.TimeoutExpired(self.process.args, timeout or 0)
+        code = self.process.wait()
+        message = f"Sandbox worker exited unexpectedly (exit code {code})"
+        stderr = self.stderr_tail()
         if stderr:
             message += f": {stderr}"
-        return TestResult(passed=False, failures=1, total=0, errors=[message])
+        return {"error": message}
+
+    def close(self) -> None:
+        with contextlib.suppress(OSError):
+            cast(Any, self.process.stdin).close()
+        try:
+            self.process.wait(timeout=1)
+        except subprocess.TimeoutExpired:
+            self.process.kill()
+            self.process.wait()
+        with contextlib.suppress(OSError):
+            cast(Any, self.process.stdout).close()
+        self.stderr.close()
+
+
+# Each thread gets its own worker, so concurrent callers (``vibesafe compile
+# --workers N``) never queue behind one another.
+_SANDBOX_LOCAL = threading.local()
+# every live worker across threads, so a finished command can stop them all
+_SANDBOX_WORKERS: set[_SandboxWorker] = set()
+_SANDBOX_WORKERS_LOCK = threading.Lock()
+
+
+def _current_sandbox_worker() -> _SandboxWorker | None:
+    """Return the calling thread's sandbox worker, if it has one."""
+
+    return getattr(_SANDBOX_LOCAL, "worker", None)
 
+
+def _discard_sandbox_worker() -> None:
+    """Stop the calling thread's sandbox worker, if any."""
+
+    worker = _current_sandbox_worker()
+    _SANDBOX_LOCAL.worker = None
+    if worker is not None:
+        with _SANDBOX_WORKERS_LOCK:
+            _SANDBOX_WORKERS.discard(worker)
+        worker.close()
+
+
+def shutdown_sandbox() -> None:
+    """Stop every sandbox worker this process started.
+
+    Commands call this when they finish, so no worker outlives the command or
+    lingers with a stale environment inside a long-running process. The next
+    sandboxed check simply starts a fresh worker.
+    """
+
+    with _SANDBOX_WORKERS_LOCK:
+        workers = list(_SANDBOX_WORKERS)
+        _SANDBOX_WORKERS.clear()
+    for worker in workers:
+        worker.close()
+    _SANDBOX_LOCAL.worker = None
+
+
+atexit.register(shutdown_sandbox)
+
+
+def _sandbox_payload(
+    key: _UnitKey, spec: dict[str, Any], impl_path: Path | None = None
+) -> dict[str, Any]:
+    return {
+        "unit_id": key.unit_id,
+        "func_name": key.func_name,
+        "sanitized": _sanitize_unit_id(key.unit_id),
+        "docstring": spec.get("docstring", ""),
+        "properties": "\n\n".join(spec.get("hypothesis_blocks", [])),
+        # Lets the worker reuse its loaded implementation while the file is unchanged.
+        "impl_path": os.fspath(impl_path) if impl_path is not None else None,
+    }
+
+
+def _sandbox_result(data: Any) -> TestResult:
+    """Convert one worker result into a TestResult, rejecting anything malformed."""
+
+    if not isinstance(data, dict):
+        return TestResult(passed=False, errors=["Sandbox returned a malformed result"])
     failures = data.get("failures", [])
+    error = data.get("error")
     total = data.get("total", 0)
+    if (
+        not isinstance(failures, list)
+        or not all(isinstance(failure, str) for failure in failures)
+        or not isinstance(error, str | None)
+        or type(total) is not int
+    ):
+        return TestResult(passed=False, errors=["Sandbox returned a malformed result"])
 
-    if completed.returncode != 0:
-        return TestResult(
-            passed=False,
-            failures=len(failures) or 1,
-            total=total,
-            errors=failures or ([stderr] if stderr else ["Sandbox execution failed"]),
-        )
+    if error:
+        failures = [error, *failures]
+
+    if failures:
+        return TestResult(passed=False, failures=len(failures), total=total, errors=failures)
 
     return TestResult(passed=True, failures=0, total=total)
 
 
+def _request_sandbox(payload: Any, sandbox_cfg, timeout: float | None) -> Any:
+    """Send one request to the calling thread's sandbox worker, (re)starting it as needed.
+
+    A worker that cannot be started answers with an ``{"error": ...}`` result, like
+    one that died, so callers report it per unit instead of aborting.
+
+    Raises:
+        subprocess.TimeoutExpired: The worker was killed; the next request respawns it.
+    """
+
+    memory_limit = sandbox_cfg.memory_mb * 1024 * 1024 if sandbox_cfg.memory_mb else 0
+    cwd = os.getcwd()
+    # Memory-limited workers serve one unit only (see _SandboxWorker); batches are
+    # split per unit before reaching here in that case.
+    unit_id = payload["unit_id"] if memory_limit and isinstance(payload, dict) else None
+
+    worker = _current_sandbox_worker()
+    if worker is None or not worker.matches(cwd, memory_limit, unit_id):
+        _discard_sandbox_worker()
+        try:
+            worker = _SandboxWorker(cwd, memory_limit, unit_id)
+        except OSError as e:
+            return {"error": f"Failed to start sandbox worker: {e}"}
+        _SANDBOX_LOCAL.worker = worker
+        with _SANDBOX_WORKERS_LOCK:
+            _SANDBOX_WORKERS.add(worker)
+
+    try:
+        data = worker.run(payload, timeout)
+    except subprocess.TimeoutExpired:
+        _discard_sandbox_worker()
+        raise
+
+    if isinstance(data, dict) and data.get("error"):
+        # The worker is gone (or never started); respawn on the next request.
+        _discard_sandbox_worker()
+
+    return data
+
+
+def _run_sandbox_checks(
+    key: _UnitKey,
+    spec: dict[str, Any],
+    sandbox_cfg,
+    impl_path: Path | None = None,
+) -> TestResult:
+    """Execute doctests/properties inside the persistent sandbox worker."""
+
+    timeout = sandbox_cfg.timeout if sandbox_cfg.timeout else None
+    payload = _sandbox_payload(key, spec, impl_path)
+    try:
+        data = _request_sandbox(payload, sandbox_cfg, timeout)
+    except subprocess.TimeoutExpired:
+        return TestResult(passed=False, failures=1, total=0, errors=["Sandbox timed out"])
+
+    return _sandbox_result(data)
+
+
+def _run_sandbox_batch(
+    units: list[tuple[_UnitKey, dict[str, Any], Path | None]],
+    sandbox_cfg,
+) -> list[TestResult]:
+    """Check many units with a single sandbox round trip.
+
+    The batch gets the per-unit timeout once per unit. If it times out or the
+    worker dies, each unit is retried on its own so the culprit is isolated and
+    the others still get a result. Under a memory limit every unit gets its own
+    worker instead, so nothing is batched.
+    """
+
+    if len(units) < 2 or sandbox_cfg.memory_mb:
+        return [_run_sandbox_checks(key, spec, sandbox_cfg, path) for key, spec, path in units]
+
+    payloads = [_sandbox_payload(key, spec, path) for key, spec, path in units]
+    timeout = sandbox_cfg.timeout * len(payloads) if sandbox_cfg.timeout else None
+    try:
+        data = _request_sandbox(payloads, sandbox_cfg, timeout)
+    except subprocess.TimeoutExpired:
+        data = None
+
+    if not isinstance(data, list) or len(data) != len(units):
+        return [_run_sandbox_checks(key, spec, sandbox_cfg, path) for key, spec, path in units]
+
+    return [_sandbox_result(item) for item in data]
+
+
+_PROPERTY_CODE_CACHE: dict[tuple[str, str], CodeType] = {}
+
+
+def _compile_properties(unit_id: str, source: str) -> CodeType:
+    """Compile a unit's property blocks once per distinct source.
+
+    The code gets a stable per-unit filename whose lines are registered with
+    ``linecache``, so tracebacks show the property source and hypothesis can
+    fingerprint the tests consistently across runs.
+    """
+
+    key = (unit_id, source)
+    code = _PROPERTY_CODE_CACHE.get(key)
+    if code is None:
+        filename = f"<vibesafe-properties:{_sanitize_unit_id(unit_id)}>"
+        lines = source.splitlines(keepends=True)
+        linecache.cache[filename] = (len(source), None, lines, filename)
+        code = compile(source, filename, "exec")
+        _PROPERTY_CODE_CACHE[key] = code
+    return code
+
+
 def _run_hypothesis_inline(unit_id: str, func: Any, blocks: list[str]) -> tuple[int, list[str]]:
-    """Execute hypothesis property blocks inline and return (count, errors)."""
+    """Execute hypothesis property blocks inline and return (count, errors).
+
+    The properties run under a stable per-unit module name and filename, so their
+    source is retrievable and hypothesis keys its example database consistently
+    across runs without writing the blocks to disk.
+    """
 
     if not blocks:
         return 0, []
 
     namespace = {
+        "__name__": f"vibesafe._props.{_sanitize_unit_id(unit_id)}",
         "load_checkpoint": load_checkpoint,
         "UNIT_ID": unit_id,
         "FUNC_NAME": func.__name__ if hasattr(func, "__name__") else "func",
@@ -478,7 +1323,7 @@ def _run_hypothesis_inline(unit_id: str, func: Any, blocks: list[str]) -> tuple[
 
     combined = "\n\n".join(blocks)
     try:
-        exec(combined, namespace)
+        exec(_compile_properties(unit_id, combined), namespace)
     except Exception as exc:  # pragma: no cover - surfaced to caller
         return 0, [f"Hypothesis block execution failed: {exc}"]
 
@@ -496,12 +1341,61 @@ def _run_hypothesis_inline(unit_id: str, func: Any, blocks: list[str]) -> tuple[
     return executed, errors
 
 
-def test_unit(unit_id: str) -> TestResult:
+# index path -> (mtime_ns, size, parsed index) of the last read
+_INDEX_CACHE: dict[str, tuple[int, int, dict[str, Any]]] = {}
+
+
+def _load_index(config) -> dict[str, Any] | None:
+    """Read the checkpoint index, or return None if it has not been written yet.
+
+    The parsed index is reused while the file's mtime and size are unchanged, so
+    repeated ``test_unit`` calls do not re-parse the TOML. Callers must not mutate it.
+    """
+
+    index_path = config.resolve_path(config.paths.index)
+    try:
+        stat = index_path.stat()
+    except FileNotFoundError:
+        return None
+
+    cache_key = str(index_path)
+    cached = _INDEX_CACHE.get(cache_key)
+    if cached is not None and cached[:2] == (stat.st_mtime_ns, stat.st_size):
+        return cached[2]
+
+    with open(index_path, "rb") as f:
+        index = tomllib.load(f)
+    _INDEX_CACHE[cache_key] = (stat.st_mtime_ns, stat.st_size, index)
+    return index
+
+
+def _iter_checkpoint_impls(index: dict[str, Any], base: Path) -> Iterator[tuple[str, str]]:
+    """Yield ``(unit_id, impl_path)`` for indexed units whose active checkpoint has an impl.py.
+
+    Works on plain strings with a single stat per checkpoint, so whole-registry runs
+    avoid building a ``Path`` for every candidate.
+    """
+
+    base_str = os.fspath(base)
+    for unit_id, unit_index in index.items():
+        active_hash = unit_index.get("active") if isinstance(unit_index, dict) else None
+        if not active_hash:
+            continue
+
+        impl_path = os.path.join(
+            base_str, *unit_id.replace(".", "/").split("/"), active_hash[:16], "impl.py"
+        )
+        if os.path.isfile(impl_path):
+            yield unit_id, impl_path
+
+
+def test_unit(unit_id: str, config: VibesafeConfig | None = None) -> TestResult:
     """
     Test the active checkpoint for a unit.
 
     Args:
         unit_id: Unit identifier
+        config: Configuration to use (defaults to the global config)
 
     Returns:
         TestResult
@@ -514,20 +1408,12 @@ def test_unit(unit_id: str) -> TestResult:
         return TestResult(passed=False, errors=[f"Unit not found: {unit_id}"])
 
     # Get active checkpoint
-    config = get_config()
+    config = config or get_config()
     try:
-        if sys.version_info >= (3, 11):
-            import tomllib
-        else:
-            import tomli as tomllib
-
-        index_path = config.resolve_path(config.paths.index)
-        if not index_path.exists():
+        index = _load_index(config)
+        if index is None:
             return TestResult(passed=False, errors=["No index file found - run compile first"])
 
-        with open(index_path, "rb") as f:
-            index = tomllib.load(f)
-
         unit_index = index.get(unit_id)
         if not unit_index:
             return TestResult(passed=False, errors=["Unit not in index - run compile first"])
@@ -539,28 +1425,219 @@ def test_unit(unit_id: str) -> TestResult:
         unit_path = unit_id.replace(".", "/")
         checkpoint_dir = checkpoints_base / unit_path / active_hash[:16]
 
-        return test_checkpoint(checkpoint_dir, unit_meta)
+        return test_checkpoint(checkpoint_dir, unit_meta, config)
 
     except Exception as e:
         return TestResult(passed=False, errors=[f"Error testing unit: {e}"])
 
 
-def run_all_tests() -> dict[str, TestResult]:
+def run_all_tests(workers: int = 1) -> dict[str, TestResult]:
     """
     Run tests for all registered units.
 
+    The index is read once and every active checkpoint is resolved in a single
+    pass before any unit is tested. Units are checked in this process unless
+    ``workers`` asks for a process pool, and those whose doctests pass are then
+    gated together in one batch. Checkpoints with a still-valid recorded pass are
+    returned without being re-checked.
+
+    Args:
+        workers: Worker processes to check units in. The default of 1 checks them
+            in-process, where the spec, module and doctest caches carry over between
+            calls. Only pass more from a single-threaded entry point such as the CLI:
+            the pool forks, and forking while other threads hold locks can deadlock.
+
     Returns:
         Dictionary mapping unit_id to TestResult
     """
     from vibesafe.core import get_registry
 
-    results = {}
-    for unit_id in get_registry():
-        results[unit_id] = test_unit(unit_id)
+    registry = get_registry()
+    config = get_config()
+
+    try:
+        index = _load_index(config)
+    except Exception as e:
+        return {
+            unit_id: TestResult(passed=False, errors=[f"Error testing unit: {e}"])
+            for unit_id in registry
+        }
+
+    if index is None:
+        return {
+            unit_id: TestResult(passed=False, errors=["No index file found - run compile first"])
+            for unit_id in registry
+        }
+
+    indexed = {unit_id: index[unit_id] for unit_id in registry if index.get(unit_id)}
+    checkpoints_base = config.resolve_path(config.paths.checkpoints)
+    impl_paths = dict(_iter_checkpoint_impls(indexed, checkpoints_base))
+
+    results: dict[str, TestResult] = {}
+    pending: dict[str, Path] = {}
+    for unit_id, unit_meta in registry.items():
+        if unit_id not in indexed:
+            results[unit_id] = TestResult(
+                passed=False, errors=["Unit not in index - run compile first"]
+            )
+            continue
 
+        impl_path = impl_paths.get(unit_id)
+        if impl_path is None:
+            results[unit_id] = TestResult(passed=False, errors=["Implementation file not found"])
+            continue
+
+        # Harnesses aggregate per module, so they are written here rather than in workers.
+        try:
+            key = _UnitKey.from_meta(unit_meta)
+            spec = _check_spec(unit_meta["func"])
+            _ensure_vibesafe_harness(key, unit_meta, spec, config)
+            cached = _cached_pass(Path(impl_path), spec, config)
+        except Exception as e:
+            results[unit_id] = TestResult(passed=False, errors=[f"Error testing unit: {e}"])
+            continue
+
+        if cached is not None:
+            results[unit_id] = cached
+            continue
+        pending[unit_id] = Path(impl_path)
+
+    try:
+        results.update(_check_units(pending, config, workers=workers))
+    finally:
+        # The sandbox worker is reused within a run; do not leave it idling after.
+        _discard_sandbox_worker()
+
+    gate_queue = {unit_id: pending[unit_id] for unit_id in pending if results[unit_id].passed}
+    if gate_queue:
+        try:
+            gate_errors = _run_quality_gates_batched(list(gate_queue.values()), config)
+        except Exception:
+            # Something in the batch (an unreadable file, paths with no common root,
+            # a failed spawn) is broken; gate each unit on its own to pin it down.
+            gate_errors = None
+        for unit_id, impl_path in gate_queue.items():
+            try:
+                if gate_errors is None:
+                    errors = _run_quality_gates(impl_path, config)
+                else:
+                    errors = gate_errors.get(impl_path)
+                if not errors:
+                    spec = _check_spec(registry[unit_id]["func"])
+                    _record_pass(impl_path, spec, config, results[unit_id])
+            except Exception as e:
+                results[unit_id] = TestResult(passed=False, errors=[f"Error testing unit: {e}"])
+                continue
+
+            if errors:
+                results[unit_id] = TestResult(
+                    passed=False,
+                    failures=len(errors),
+                    total=results[unit_id].total,
+                    errors=errors,
+                )
+
+    return {unit_id: results[unit_id] for unit_id in registry}
+
+
+def _check_unit(unit_id: str, impl_path: str, config: VibesafeConfig) -> TestResult:
+    """Run one registered unit's checks; safe to call inside a pool worker."""
+
+    from vibesafe.core import get_unit
+
+    unit_meta = get_unit(unit_id)
+    if not unit_meta:
+        return TestResult(passed=False, errors=[f"Unit not found: {unit_id}"])
+
+    try:
+        spec = _check_spec(unit_meta["func"])
+        return _run_checks(Path(impl_path), _UnitKey.from_meta(unit_meta), spec, config)
+    except Exception as e:
+        return TestResult(passed=False, errors=[f"Error testing unit: {e}"])
+
+
+def _check_units_sandboxed(pending: dict[str, Path], sandbox_cfg) -> dict[str, TestResult]:
+    from vibesafe.core import get_unit
+
+    results: dict[str, TestResult] = {}
+    batch: list[tuple[_UnitKey, dict[str, Any], Path | None]] = []
+    for unit_id, impl_path in pending.items():
+        unit_meta = get_unit(unit_id)
+        if not unit_meta:
+            results[unit_id] = TestResult(passed=False, errors=[f"Unit not found: {unit_id}"])
+            continue
+        try:
+            batch.append((_UnitKey.from_meta(unit_meta), _check_spec(unit_meta["func"]), impl_path))
+        except Exception as e:
+            results[unit_id] = TestResult(passed=False, errors=[f"Error testing unit: {e}"])
+
+    outcomes = _run_sandbox_batch(batch, sandbox_cfg)
+    for (key, _, _), outcome in zip(batch, outcomes):
+        results[key.unit_id] = outcome
+    return results
+
+
+def _fork_context() -> BaseContext | None:
+    """Return a fork-based multiprocessing context, or None where fork is unsafe.
+
+    Pool workers must inherit the in-memory unit registry, which only ``fork``
+    provides; macOS and Windows fall back to serial execution. Callers opt in
+    through ``run_all_tests(workers=...)`` and must not have other threads running.
+    """
+
+    if sys.platform == "darwin" or "fork" not in multiprocessing.get_all_start_methods():
+        return None
+    return multiprocessing.get_context("fork")
+
+
+def _reset_pool_worker() -> None:
+    """Drop state inherited from the parent that a forked worker must not share."""
+
+    global _SANDBOX_LOCAL, _SANDBOX_WORKERS
+    # The parent's workers and their pipes belong to the parent.
+    _SANDBOX_LOCAL = threading.local()
+    _SANDBOX_WORKERS = set()
+
+
+def _check_units(
+    pending: dict[str, Path], config: VibesafeConfig, workers: int = 1
+) -> dict[str, TestResult]:
+    """Run checks for many units, in-process or across ``workers`` pool processes.
+
+    Sandboxed runs instead go to the sandbox worker as one batch, so the whole
+    registry pays for a single interpreter start.
+    """
+
+    sandbox_cfg = config.sandbox
+    if sandbox_cfg.enabled:
+        return _check_units_sandboxed(pending, sandbox_cfg)
+
+    context = _fork_context() if workers > 1 else None
+    if len(pending) < 2 or context is None:
+        return {
+            unit_id: _check_unit(unit_id, str(path), config) for unit_id, path in pending.items()
+        }
+
+    results: dict[str, TestResult] = {}
+    with ProcessPoolExecutor(
+        max_workers=min(len(pending), workers),
+        mp_context=context,
+        initializer=_reset_pool_worker,
+    ) as pool:
+        futures = {
+            pool.submit(_check_unit, unit_id, str(path), config): unit_id
+            for unit_id, path in pending.items()
+        }
+        for future in as_completed(futures):
+            unit_id = futures[future]
+            try:
+                results[unit_id] = future.result()
+            except Exception as e:  # e.g. a worker crashed inside generated code
+                results[unit_id] = TestResult(passed=False, errors=[f"Error testing unit: {e}"])
     return results
 
 
-# Prevent pytest from auto-collecting helper functions
+# Prevent pytest from auto-collecting these wherever they are imported
+cast(Any, TestResult).__test__ = False
 cast(Any, test_checkpoint).__test__ = False
 cast(Any, test_unit).__test__ = False
@@ -5,6 +5,7 @@ Shared pytest fixtures for vibesafe tests.
 import importlib
 from collections.abc import Callable
 from pathlib import Path
+from types import SimpleNamespace
 from typing import Any
 
 import pytest
@@ -13,31 +14,8 @@ import vibesafe.core as vibesafe_core
 from vibesafe import VibeCoded, vibesafe
 from vibesafe.config import VibesafeConfig, get_config
 
-# Tell pytest not to collect test_checkpoint and test_unit from vibesafe.testing
-collect_ignore_glob = []
-
-
-def pytest_collection_modifyitems(items):
-    """Filter out test_checkpoint and test_unit functions from vibesafe.testing module."""
-    filtered_items = []
-    for item in items:
-        # Skip if it's from src/vibesafe/testing.py
-        if "src/vibesafe/testing.py" in str(item.fspath):
-            continue
-        filtered_items.append(item)
-    items[:] = filtered_items
-
-
-@pytest.fixture
-def temp_dir(tmp_path: Path) -> Path:
-    """Provide a temporary directory for tests."""
-    return tmp_path
-
-
-@pytest.fixture
-def config_file(temp_dir: Path) -> Path:
-    """Create a test configuration file."""
-    config_content = """
+# File bodies shared by the fixtures below, encoded once at import.
+_CONFIG_TOML = b"""
 [project]
 python = ">=3.12"
 env = "dev"
@@ -67,8 +45,59 @@ enabled = false
 timeout = 10
 memory_mb = 256
 """
+
+_SAMPLE_IMPL = b"""
+def func(a: int, b: int) -> int:
+    \"\"\"Add two numbers.\"\"\"
+    return a + b
+"""
+
+_SAMPLE_META = b"""
+spec_sha = "abc123def456"
+chk_sha = "def456ghi789"
+prompt_sha = "ghi789jkl012"
+vibesafe_version = "0.2.1"
+provider = "openai-compatible:gpt-4o-mini"
+template = "function.j2"
+
+[signature]
+text = '''def add_numbers(a: int, b: int) -> int'''
+
+[docstring]
+text = '''Add two numbers.'''
+"""
+
+_LLM_COMPLETION = """
+def add_numbers(a: int, b: int) -> int:
+    \"\"\"
+    Add two numbers.
+
+    >>> add_numbers(2, 3)
+    5
+    >>> add_numbers(10, 20)
+    30
+    \"\"\"
+    return a + b
+"""
+
+
+@pytest.fixture
+def temp_dir(tmp_path: Path) -> Path:
+    """Provide a temporary directory for tests."""
+    return tmp_path
+
+
+@pytest.fixture(scope="session")
+def empty_cwd(tmp_path_factory: pytest.TempPathFactory) -> Path:
+    """Shared empty directory for tests that only need a project-less cwd; never write here."""
+    return tmp_path_factory.mktemp("empty_cwd")
+
+
+@pytest.fixture
+def config_file(temp_dir: Path) -> Path:
+    """Create a test configuration file."""
     config_path = temp_dir / "vibesafe.toml"
-    config_path.write_text(config_content)
+    config_path.write_bytes(_CONFIG_TOML)
     return config_path
 
 
@@ -118,39 +147,14 @@ def sample_async_function() -> Callable[..., Any]:
 
 
 @pytest.fixture
-def mock_llm_response(mocker: Any) -> Any:
-    """Mock LLM provider response."""
-
-    def add_numbers(a: int, b: int) -> int:
-        """
-        Add two numbers.
-
-        >>> add_numbers(2, 3)
-        5
-        >>> add_numbers(10, 20)
-        30
-        """
-        return a + b
-
-    # Mock the OpenAI client
-    mock_client = mocker.MagicMock()
-    mock_response = mocker.MagicMock()
-    mock_response.choices = [mocker.MagicMock()]
-    mock_response.choices[0].message.content = """
-def add_numbers(a: int, b: int) -> int:
-    \"\"\"
-    Add two numbers.
-
-    >>> add_numbers(2, 3)
-    5
-    >>> add_numbers(10, 20)
-    30
-    \"\"\"
-    return a + b
-"""
-    mock_client.chat.completions.create.return_value = mock_response
-
-    return mock_client
+def mock_llm_response() -> SimpleNamespace:
+    """Stub OpenAI-style client whose chat completion returns _LLM_COMPLETION."""
+    response = SimpleNamespace(
+        choices=[SimpleNamespace(message=SimpleNamespace(content=_LLM_COMPLETION))]
+    )
+    return SimpleNamespace(
+        chat=SimpleNamespace(completions=SimpleNamespace(create=lambda **kwargs: response))
+    )
 
 
 @pytest.fixture
@@ -164,65 +168,44 @@ def checkpoint_dir(temp_dir: Path) -> Path:
 @pytest.fixture
 def sample_impl(checkpoint_dir: Path) -> Path:
     """Create a sample implementation file."""
-    impl_code = """
-def func(a: int, b: int) -> int:
-    \"\"\"Add two numbers.\"\"\"
-    return a + b
-"""
     impl_path = checkpoint_dir / "impl.py"
-    impl_path.write_text(impl_code)
+    impl_path.write_bytes(_SAMPLE_IMPL)
     return impl_path
 
 
 @pytest.fixture
 def sample_meta(checkpoint_dir: Path) -> Path:
     """Create sample metadata file."""
-    meta_content = """
-spec_sha = "abc123def456"
-chk_sha = "def456ghi789"
-prompt_sha = "ghi789jkl012"
-vibesafe_version = "0.2.1"
-provider = "openai-compatible:gpt-4o-mini"
-template = "function.j2"
-
-[signature]
-text = '''def add_numbers(a: int, b: int) -> int'''
-
-[docstring]
-text = '''Add two numbers.'''
-"""
     meta_path = checkpoint_dir / "meta.toml"
-    meta_path.write_text(meta_content)
+    meta_path.write_bytes(_SAMPLE_META)
     return meta_path
 
 
-@pytest.fixture
-def clear_vibesafe_registry():
-    """Clear vibesafe registry between tests."""
-    # Ensure default example modules are registered once so the baseline registry matches docs
-    if not getattr(clear_vibesafe_registry, "_seeded", False):
+@pytest.fixture(scope="session")
+def _seed_example_modules() -> None:
+    """Register the default example modules once so the baseline registry matches docs."""
+    for module in ("examples.math.ops", "examples.api.routes"):
         try:
-            for module in ("examples.math.ops", "examples.api.routes"):
-                importlib.import_module(module)
+            importlib.import_module(module)
         except ImportError:
             pass  # Examples might not be in path during tests
-        clear_vibesafe_registry._seeded = True
 
-    # Store original registry
-    original = vibesafe_core._registry.copy()
-    vibesafe_core._registry.clear()
+
+@pytest.fixture
+def clear_vibesafe_registry(_seed_example_modules: None):
+    """Clear vibesafe registry between tests."""
+    # Swap in an empty registry; core only reaches it through the module global
+    original = vibesafe_core._registry
+    vibesafe_core._registry = {}
 
     # Remove index file so tests start without active checkpoints
     config = get_config(reload=True)
-    index_path = config.resolve_path(config.paths.index)
-    if index_path.exists():
-        index_path.unlink()
+    config.resolve_path(config.paths.index).unlink(missing_ok=True)
 
     yield
 
     # Restore original registry
-    vibesafe_core._registry.clear()
-    vibesafe_core._registry.update(original)
+    vibesafe_core._registry = original
 
 
 @pytest.fixture(autouse=True)
@@ -1,5 +1,7 @@
 """Tests for vibesafe.ast_parser module."""
 
+import pytest
+
 from vibesafe import VibeCoded, vibesafe
 from vibesafe.ast_parser import SpecExtractor, extract_spec
 
@@ -9,60 +11,80 @@ def helper_dependency(value: int) -> int:
     return value + 1
 
 
-class TestSpecExtractor:
-    """Tests for SpecExtractor class."""
+def _signature_func(a: int, b: str) -> int:
+    """Test."""
+    pass
 
-    def test_extract_signature_basic(self, clear_vibesafe_registry):
-        """Test extracting basic function signature."""
 
-        def test_func(a: int, b: str) -> int:
-            """Test."""
-            pass
+async def _async_func(x: int) -> str:
+    """Async test."""
+    pass
 
-        extractor = SpecExtractor(test_func)
-        signature = extractor.extract_signature()
-        assert "def test_func" in signature
-        assert "a: int" in signature
-        assert "b: str" in signature
-        assert "-> int" in signature
 
-    def test_extract_signature_async(self, clear_vibesafe_registry):
-        """Test extracting async function signature."""
+def _documented_func():
+    """This is a docstring with details."""
+    pass
 
-        async def async_func(x: int) -> str:
-            """Async test."""
-            pass
 
-        extractor = SpecExtractor(async_func)
-        signature = extractor.extract_signature()
-        assert "async def async_func" in signature
+def _multiline_func():
+    """
+    First line.
+    Second line.
+    Third line.
+    """
+    pass
 
-    def test_extract_docstring(self, clear_vibesafe_registry):
-        """Test extracting docstring."""
 
-        def documented_func():
-            """This is a docstring with details."""
-            pass
+def _complete_func(a: int, b: int) -> int:
+    """
+    Add two numbers.
 
-        extractor = SpecExtractor(documented_func)
-        docstring = extractor.extract_docstring()
-        assert docstring == "This is a docstring with details."
+    >>> _complete_func(2, 3)
+    5
+    """
+    raise VibeCoded()
 
-    def test_extract_docstring_multiline(self, clear_vibesafe_registry):
-        """Test extracting multiline docstring."""
 
-        def multiline_func():
-            """
-            First line.
-            Second line.
-            Third line.
-            """
-            pass
+@pytest.fixture(scope="module")
+def complete_spec() -> dict:
+    """to_dict() of _complete_func, computed once for the module."""
+    return SpecExtractor(_complete_func).to_dict()
+
+
+@pytest.fixture
+def extractor(request: pytest.FixtureRequest) -> SpecExtractor:
+    """Build the SpecExtractor for a parametrized sample function."""
+    return SpecExtractor(request.param)
 
-        extractor = SpecExtractor(multiline_func)
-        docstring = extractor.extract_docstring()
-        assert "First line." in docstring
-        assert "Second line." in docstring
+
+class TestSpecExtractor:
+    """Tests for SpecExtractor class."""
+
+    @pytest.mark.parametrize(
+        ("extractor", "fragments"),
+        [
+            (_signature_func, ["def _signature_func", "a: int", "b: str", "-> int"]),
+            (_async_func, ["async def _async_func"]),
+        ],
+        indirect=["extractor"],
+    )
+    def test_extract_signature(self, extractor, fragments, clear_vibesafe_registry):
+        """Test extracting plain and async function signatures."""
+        signature = extractor.extract_signature()
+        for fragment in fragments:
+            assert fragment in signature
+
+    @pytest.mark.parametrize(
+        ("extractor", "expected"),
+        [
+            (_documented_func, "This is a docstring with details."),
+            (_multiline_func, "First line.\nSecond line.\nThird line."),
+        ],
+        indirect=["extractor"],
+    )
+    def test_extract_docstring(self, extractor, expected, clear_vibesafe_registry):
+        """Test extracting single and multiline docstrings."""
+        assert extractor.extract_docstring() == expected
 
     def test_extract_body_before_handled(self, clear_vibesafe_registry):
         """Test extracting body before VibeCoded."""
@@ -98,6 +120,17 @@ class TestSpecExtractor:
         assert "doctest_func(5)" in examples[0].source
         assert "6" in examples[0].want
 
+    def test_extract_doctests_skips_parser_without_prompt(self, monkeypatch):
+        """Docstrings without a >>> prompt never reach the doctest parser."""
+        from vibesafe import ast_parser
+
+        def failing_get_examples(docstring):
+            raise AssertionError("parser should not run")
+
+        monkeypatch.setattr(ast_parser._DOCTEST_PARSER, "get_examples", failing_get_examples)
+
+        assert SpecExtractor(_documented_func).extract_doctests() == []
+
     def test_extract_dependencies(self, clear_vibesafe_registry):
         """Test extracting dependencies."""
 
@@ -115,28 +148,40 @@ class TestSpecExtractor:
         assert helper["path"].endswith("tests/test_ast_parser.py")
         assert helper["file_hash"]
 
-    def test_to_dict(self, clear_vibesafe_registry):
+    @pytest.mark.parametrize(
+        "key",
+        ["signature", "docstring", "body_before_handled", "doctests", "dependencies", "source"],
+    )
+    def test_to_dict(self, complete_spec, key):
         """Test converting extraction to dictionary."""
+        assert key in complete_spec
 
-        @vibesafe
-        def complete_func(a: int, b: int) -> int:
+    def test_to_dict_reads_docstring_once(self, clear_vibesafe_registry, monkeypatch):
+        """The docstring is fetched once per extractor and shared by every extractor."""
+        import inspect
+
+        def add(a: int, b: int) -> int:
             """
             Add two numbers.
 
-            >>> complete_func(2, 3)
+            >>> add(2, 3)
             5
             """
-            raise VibeCoded()
+            return a + b
+
+        extractor = SpecExtractor(add)
+        calls = []
+        real_getdoc = inspect.getdoc
 
-        extractor = SpecExtractor(complete_func)
-        spec_dict = extractor.to_dict()
+        def counting_getdoc(obj):
+            calls.append(obj)
+            return real_getdoc(obj)
 
-        assert "signature" in spec_dict
-        assert "docstring" in spec_dict
-        assert "body_before_handled" in spec_dict
-        assert "doctests" in spec_dict
-        assert "dependencies" in spec_dict
-        assert "source" in spec_dict
+        monkeypatch.setattr(inspect, "getdoc", counting_getdoc)
+        extractor.to_dict()
+        extractor.to_dict()
+
+        assert calls == [add]
 
 
 class TestExtractSpec:
@@ -194,3 +239,45 @@ class TestExtractSpec:
         blocks = spec["hypothesis_blocks"]
         assert len(blocks) == 1
         assert "given(" in blocks[0]
+
+
+class TestCachedExtractor:
+    """Tests for the shared per-function extractor."""
+
+    def test_extractor_reused_and_freed_with_function(self):
+        """One extractor serves a function for its lifetime and is collected with it."""
+        import gc
+        import weakref
+
+        from vibesafe.ast_parser import cached_extractor
+
+        def short_lived(x: int) -> int:
+            """Short-lived."""
+            return x
+
+        extractor = cached_extractor(short_lived)
+        assert cached_extractor(short_lived) is extractor
+
+        ref = weakref.ref(extractor)
+        del extractor, short_lived
+        gc.collect()
+        assert ref() is None
+
+    def test_wrapper_does_not_reuse_wrapped_extractor(self):
+        """An extractor copied onto a wrapper by functools.wraps is not reused for it."""
+        import functools
+
+        from vibesafe.ast_parser import cached_extractor
+
+        def inner(x: int) -> int:
+            """Inner."""
+            return x
+
+        inner_extractor = cached_extractor(inner)
+
+        @functools.wraps(inner)
+        def outer(x: int) -> int:
+            return inner(x)
+
+        assert cached_extractor(outer) is not inner_extractor
+        assert cached_extractor(outer).func is outer
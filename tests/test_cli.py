@@ -3,8 +3,8 @@ Tests for vibesafe.cli module.
 """
 
 from pathlib import Path
-from unittest.mock import MagicMock
 
+import click
 import pytest
 from click.testing import CliRunner
 
@@ -25,33 +25,66 @@ from vibesafe.cli import (
 )
 
 
+class _RecordingConsole:
+    """Stand-in for the rich console that keeps the first argument of each print."""
+
+    def __init__(self) -> None:
+        self.printed: list[object] = []
+
+    def print(self, *args, **kwargs) -> None:
+        self.printed.append(args[0] if args else "")
+
+    def __getattr__(self, name):
+        return lambda *args, **kwargs: None
+
+
+def _help_text(cmd: click.Command) -> str:
+    """Render a command's --help text without invoking it."""
+    return cmd.get_help(click.Context(cmd, info_name=cmd.name))
+
+
+def _call(cmd: click.Command, **params):
+    """Run a command's callback directly, skipping Click's parsing and dispatch."""
+    assert cmd.callback is not None
+    return cmd.callback(**params)
+
+
+@pytest.fixture(scope="module")
+def runner():
+    """Create CLI test runner; it keeps no state between invocations."""
+    return CliRunner()
+
+
 class TestCLI:
     """Tests for CLI commands."""
 
-    @pytest.fixture
-    def runner(self):
-        """Create CLI test runner."""
-        return CliRunner()
-
     @pytest.fixture(autouse=True)
     def mock_console(self, monkeypatch):
-        """Patch the global console object with a MagicMock."""
-        mock = MagicMock()
+        """Patch the global console object with a recording stub."""
+        mock = _RecordingConsole()
         monkeypatch.setattr("vibesafe.cli.console", mock)
         return mock
 
     def assert_console_output(self, mock_console, text):
         """Assert that the text was printed to the console."""
-        output = "\n".join(
-            str(call.args[0]) if call.args else "" for call in mock_console.print.call_args_list
-        )
-        assert text in output
-
-    def test_main_help(self, runner):
-        """Test main command help."""
-        result = runner.invoke(main, ["--help"])
-        assert result.exit_code == 0
-        assert "Vibesafe" in result.output
+        assert any(text in str(printed) for printed in mock_console.printed), mock_console.printed
+
+    @pytest.mark.parametrize(
+        ("cmd", "needle"),
+        [
+            (main, "Vibesafe"),
+            (test, "test"),
+            (save, "save"),
+            (status, "status"),
+            (diff, "diff"),
+            (check, "lint"),
+            (repl, "Interactive"),
+        ],
+        ids=lambda value: getattr(value, "name", None) or value,
+    )
+    def test_help(self, cmd, needle):
+        """Each command's help describes the command."""
+        assert needle in _help_text(cmd)
 
     def test_main_version(self, runner):
         """Test version flag."""
@@ -59,32 +92,44 @@ class TestCLI:
         assert result.exit_code == 0
         assert __version__ in result.output
 
+    def test_command_shuts_down_sandbox_workers(
+        self, runner, empty_cwd, monkeypatch, clear_vibesafe_registry
+    ):
+        """Sandbox workers are stopped when a command finishes."""
+        calls = []
+        monkeypatch.setattr("vibesafe.cli.shutdown_sandbox", lambda: calls.append(True))
+        monkeypatch.chdir(empty_cwd)
+
+        runner.invoke(main, ["scan"])
+
+        assert calls == [True]
+
     def test_scan_no_units(
-        self, runner, temp_dir, monkeypatch, clear_vibesafe_registry, mock_console
+        self, runner, empty_cwd, monkeypatch, clear_vibesafe_registry, mock_console
     ):
         """Test scan with no units."""
-        monkeypatch.chdir(temp_dir)
+        monkeypatch.chdir(empty_cwd)
         result = runner.invoke(scan)
         self.assert_console_output(mock_console, "No vibesafe units found")
 
     def test_status_no_units(
-        self, runner, temp_dir, monkeypatch, clear_vibesafe_registry, mock_console
+        self, runner, empty_cwd, monkeypatch, clear_vibesafe_registry, mock_console
     ):
         """Test status with no units registered."""
-        monkeypatch.chdir(temp_dir)
+        monkeypatch.chdir(empty_cwd)
         result = runner.invoke(status)
         self.assert_console_output(mock_console, "No vibesafe units found")
 
     def test_diff_no_units(
-        self, runner, temp_dir, monkeypatch, clear_vibesafe_registry, mock_console
+        self, runner, empty_cwd, monkeypatch, clear_vibesafe_registry, mock_console
     ):
         """Test diff with no units registered."""
-        monkeypatch.chdir(temp_dir)
+        monkeypatch.chdir(empty_cwd)
         result = runner.invoke(diff)
         self.assert_console_output(mock_console, "No vibesafe units found")
 
     def test_scan_with_units(
-        self, runner, temp_dir, monkeypatch, clear_vibesafe_registry, mock_console
+        self, runner, empty_cwd, monkeypatch, clear_vibesafe_registry, mock_console
     ):
         """Test scan with registered units."""
 
@@ -93,18 +138,10 @@ class TestCLI:
             """Test."""
             raise VibeCoded()
 
-        monkeypatch.chdir(temp_dir)
+        monkeypatch.chdir(empty_cwd)
         result = runner.invoke(scan)
 
-        if result.exit_code != 0:
-            with open("/home/diwank/github.com/julep-ai/vibesafe/debug_cli.txt", "w") as f:
-                f.write(f"Output: {result.output}\n")
-                f.write(f"Exception: {result.exception}\n")
-                import traceback
-
-                traceback.print_tb(result.exc_info[2], file=f)
-
-        assert result.exit_code == 0
+        assert result.exit_code == 0, f"stdout={result.output}\nexc={result.exception!r}"
 
     def test_scan_discovers_packages_outside_src(
         self, runner, temp_dir, monkeypatch, clear_vibesafe_registry, mock_console
@@ -136,21 +173,20 @@ def add(x: int, y: int) -> int:
         self.assert_console_output(mock_console, "Total units:")
 
     def test_compile_no_units(
-        self, runner, temp_dir, monkeypatch, clear_vibesafe_registry, mock_console
+        self, runner, empty_cwd, monkeypatch, clear_vibesafe_registry, mock_console
     ):
         """Test compile with no units."""
-        monkeypatch.chdir(temp_dir)
+        monkeypatch.chdir(empty_cwd)
         result = runner.invoke(compile)
         assert result.exit_code == 1
         self.assert_console_output(mock_console, "No vibesafe units found")
 
-    def test_compile_help(self, runner):
+    def test_compile_help(self):
         """Test compile command help."""
-        result = runner.invoke(compile, ["--help"])
-        assert result.exit_code == 0
-        assert "compile" in result.output.lower()
-        assert "--workers" in result.output
-        assert "--max-iterations" in result.output
+        text = _help_text(compile)
+        assert "compile" in text.lower()
+        assert "--workers" in text
+        assert "--max-iterations" in text
 
     def test_compile_workers_parallel(
         self, runner, temp_dir, monkeypatch, clear_vibesafe_registry, mock_console
@@ -239,50 +275,30 @@ def add(x: int, y: int) -> int:
         assert result_force.exit_code == 0
         assert "gpt-5-mini" in cfg.read_text()
 
-    def test_test_help(self, runner):
-        """Test test command help."""
-        result = runner.invoke(test, ["--help"])
-        assert result.exit_code == 0
-        assert "test" in result.output.lower()
-
-    def test_save_help(self, runner):
-        """Test save command help."""
-        result = runner.invoke(save, ["--help"])
-        assert result.exit_code == 0
-        assert "save" in result.output.lower()
-
-    def test_status_help(self, runner):
-        """Test status command help."""
-        result = runner.invoke(status, ["--help"])
-        assert result.exit_code == 0
-        assert "status" in result.output.lower()
+    @pytest.fixture
+    def stub_check_helpers(self, monkeypatch):
+        """Stub the check command's helpers; returns the commands it ran."""
+        commands: list[list[str]] = []
 
-    def test_diff_help(self, runner):
-        """Test diff command help."""
-        result = runner.invoke(diff, ["--help"])
-        assert result.exit_code == 0
-        assert "diff" in result.output.lower()
+        def _record_command(cmd: list[str]) -> bool:
+            commands.append(cmd)
+            return True
 
-    def test_check_help(self, runner):
-        """Test check command help."""
-        result = runner.invoke(check, ["--help"])
-        assert result.exit_code == 0
-        assert "lint" in result.output.lower()
+        monkeypatch.setattr("vibesafe.cli._import_project_modules", lambda: None)
+        monkeypatch.setattr("vibesafe.cli.run_all_tests", lambda: {})
+        monkeypatch.setattr("vibesafe.cli._detect_drift", lambda: (0, False))
+        monkeypatch.setattr("vibesafe.cli._run_command", _record_command)
+        return commands
 
     def test_check_runs(
         self,
         runner,
-        monkeypatch,
+        stub_check_helpers,
         clear_vibesafe_registry,
         mock_console,
     ):
         """Check command succeeds when helpers succeed."""
 
-        monkeypatch.setattr("vibesafe.cli._import_project_modules", lambda: None)
-        monkeypatch.setattr("vibesafe.cli._run_command", lambda cmd: True)
-        monkeypatch.setattr("vibesafe.cli.run_all_tests", lambda: {})
-        monkeypatch.setattr("vibesafe.cli._detect_drift", lambda: (0, False))
-
         result = runner.invoke(check)
         assert result.exit_code == 0
         self.assert_console_output(mock_console, "Check complete")
@@ -292,6 +308,7 @@ def add(x: int, y: int) -> int:
         runner,
         temp_dir,
         monkeypatch,
+        stub_check_helpers,
         clear_vibesafe_registry,
         mock_console,
     ):
@@ -300,17 +317,7 @@ def add(x: int, y: int) -> int:
         monkeypatch.chdir(temp_dir)
         (temp_dir / "src").mkdir()
 
-        commands: list[list[str]] = []
-
-        monkeypatch.setattr("vibesafe.cli._import_project_modules", lambda: None)
-        monkeypatch.setattr("vibesafe.cli.run_all_tests", lambda: {})
-        monkeypatch.setattr("vibesafe.cli._detect_drift", lambda: (0, False))
-
-        def _record_command(cmd: list[str]) -> bool:
-            commands.append(cmd)
-            return True
-
-        monkeypatch.setattr("vibesafe.cli._run_command", _record_command)
+        commands = stub_check_helpers
 
         result = runner.invoke(check)
 
@@ -322,26 +329,17 @@ def add(x: int, y: int) -> int:
     def test_check_skips_lint_when_no_targets(
         self,
         runner,
-        temp_dir,
+        empty_cwd,
         monkeypatch,
+        stub_check_helpers,
         clear_vibesafe_registry,
         mock_console,
     ):
         """Check command skips linting when no directories exist."""
 
-        monkeypatch.chdir(temp_dir)
-
-        commands: list[list[str]] = []
-
-        monkeypatch.setattr("vibesafe.cli._import_project_modules", lambda: None)
-        monkeypatch.setattr("vibesafe.cli.run_all_tests", lambda: {})
-        monkeypatch.setattr("vibesafe.cli._detect_drift", lambda: (0, False))
-
-        def _record_command(cmd: list[str]) -> bool:
-            commands.append(cmd)
-            return True
+        monkeypatch.chdir(empty_cwd)
 
-        monkeypatch.setattr("vibesafe.cli._run_command", _record_command)
+        commands = stub_check_helpers
 
         result = runner.invoke(check)
 
@@ -351,17 +349,11 @@ def add(x: int, y: int) -> int:
         self.assert_console_output(mock_console, "No mypy target found")
         self.assert_console_output(mock_console, "Check complete")
 
-    def test_repl_help(self, runner):
-        """Test repl command help."""
-        result = runner.invoke(repl, ["--help"])
-        assert result.exit_code == 0
-        assert "Interactive" in result.output
-
     def test_repl_requires_target(
-        self, runner, temp_dir, monkeypatch, clear_vibesafe_registry, mock_console
+        self, runner, empty_cwd, monkeypatch, clear_vibesafe_registry, mock_console
     ):
         """REPL without --target should exit with guidance."""
-        monkeypatch.chdir(temp_dir)
+        monkeypatch.chdir(empty_cwd)
         monkeypatch.setattr("vibesafe.cli._import_project_modules", lambda: None)
         monkeypatch.setattr("vibesafe.cli.get_registry", lambda: {"demo/unit": {}})
         result = runner.invoke(repl)
@@ -369,10 +361,10 @@ def add(x: int, y: int) -> int:
         self.assert_console_output(mock_console, "Specify --target")
 
     def test_repl_unknown_unit(
-        self, runner, temp_dir, monkeypatch, clear_vibesafe_registry, mock_console
+        self, runner, empty_cwd, monkeypatch, clear_vibesafe_registry, mock_console
     ):
         """Unknown unit should be rejected."""
-        monkeypatch.chdir(temp_dir)
+        monkeypatch.chdir(empty_cwd)
         monkeypatch.setattr("vibesafe.cli._import_project_modules", lambda: None)
         monkeypatch.setattr(
             "vibesafe.cli.get_registry",
@@ -385,14 +377,14 @@ def add(x: int, y: int) -> int:
     def test_repl_quit_immediately(
         self,
         runner,
-        temp_dir,
+        empty_cwd,
         monkeypatch,
         clear_vibesafe_registry,
         mock_console,
     ):
         """REPL processes summary then exits on 'q'."""
 
-        monkeypatch.chdir(temp_dir)
+        monkeypatch.chdir(empty_cwd)
         monkeypatch.setattr("vibesafe.cli._import_project_modules", lambda: None)
 
         @vibesafe
@@ -416,33 +408,25 @@ def add(x: int, y: int) -> int:
 
         result = runner.invoke(repl, ["--target", unit_id], input="q\n")
 
-        if result.exit_code != 0:
-            with open("/home/diwank/github.com/julep-ai/vibesafe/debug_cli.txt", "w") as f:
-                f.write(f"Output: {result.output}\n")
-                f.write(f"Exception: {result.exception}\n")
-                import traceback
-
-                traceback.print_tb(result.exc_info[2], file=f)
-
-        assert result.exit_code == 0
+        assert result.exit_code == 0, f"stdout={result.output}\nexc={result.exception!r}"
         self.assert_console_output(mock_console, "Bye!")
 
-    def test_compile_force_flag(self, runner):
-        """Test compile with --force flag."""
-        result = runner.invoke(compile, ["--force", "--help"])
-        assert result.exit_code == 0
-
-    def test_compile_target_flag(self, runner):
-        """Test compile with --target flag."""
-        result = runner.invoke(compile, ["--target", "test/unit", "--help"])
-        assert result.exit_code == 0
+    @pytest.mark.parametrize(
+        ("args", "expected"),
+        [(["--force"], {"force": True}), (["--target", "test/unit"], {"target": "test/unit"})],
+        ids=["force", "target"],
+    )
+    def test_compile_flags_accepted(self, args, expected):
+        """compile parses its --force and --target flags."""
+        params = compile.make_context("compile", args).params
+        assert {name: params[name] for name in expected} == expected
 
     def test_save_freeze_flag(
-        self, runner, temp_dir, monkeypatch, clear_vibesafe_registry, mocker, mock_console
+        self, runner, empty_cwd, monkeypatch, clear_vibesafe_registry, mock_console
     ):
         """save --freeze-http-deps triggers dependency capture."""
 
-        monkeypatch.chdir(temp_dir)
+        monkeypatch.chdir(empty_cwd)
 
         @vibesafe
         def example(x: int) -> int:
@@ -465,43 +449,39 @@ def add(x: int, y: int) -> int:
             def __bool__(self):
                 return True
 
-        mocker.patch("vibesafe.cli.test_unit", return_value=_Result())
-        mocker.patch("vibesafe.cli.get_registry", return_value={unit_id: {}})
+        monkeypatch.setattr("vibesafe.cli.test_unit", lambda *args, **kwargs: _Result())
+        monkeypatch.setattr("vibesafe.cli.get_registry", lambda: {unit_id: {}})
         freeze_called = {}
 
         def _freeze(units, config):
             freeze_called["units"] = units
 
-        mocker.patch("vibesafe.cli._freeze_http_dependencies", side_effect=_freeze)
+        monkeypatch.setattr("vibesafe.cli._freeze_http_dependencies", _freeze)
 
         result = runner.invoke(save, ["--target", unit_id, "--freeze-http-deps"])
         assert result.exit_code == 0
         assert unit_id in freeze_called.get("units", [])
         self.assert_console_output(mock_console, "Tests passed")
 
-    def test_mode_set_persists(self, runner, temp_dir, monkeypatch, mock_console):
+    def test_mode_set_persists(self, temp_dir, monkeypatch, mock_console):
         """mode --value writes .vibesafe/mode."""
         monkeypatch.chdir(temp_dir)
-        result = runner.invoke(mode, ["--value", "prod"])
-        assert result.exit_code == 0
+        _call(mode, value="prod", clear=False)
         mode_file = Path(temp_dir) / ".vibesafe" / "mode"
         assert mode_file.read_text() == "prod"
         self.assert_console_output(mock_console, "Persisted mode set to 'prod'")
 
-    def test_mode_show_reads_persisted(self, runner, temp_dir, monkeypatch, mock_console):
+    def test_mode_show_reads_persisted(self, temp_dir, monkeypatch, mock_console):
         """mode (no args) reports effective mode from persisted file."""
         monkeypatch.chdir(temp_dir)
         mode_file = Path(temp_dir) / ".vibesafe" / "mode"
         mode_file.parent.mkdir(parents=True, exist_ok=True)
         mode_file.write_text("dev")
 
-        result = runner.invoke(mode)
-        assert result.exit_code == 0
+        _call(mode, value=None, clear=False)
         self.assert_console_output(mock_console, "Effective mode: dev")
 
-    def test_install_claude_plugin_prints_instructions(
-        self, runner, monkeypatch, mock_console, temp_dir
-    ):
+    def test_install_claude_plugin_prints_instructions(self, runner, monkeypatch, mock_console):
         """install-claude-plugin should print manual instructions."""
 
         def fake_which(prog: str):
@@ -1,5 +1,7 @@
 """Tests for error handling paths in vibesafe.codegen."""
 
+from types import SimpleNamespace
+
 import pytest
 
 from vibesafe import VibeCoded, get_unit, vibesafe
@@ -7,13 +9,31 @@ from vibesafe.codegen import CodeGenerator
 from vibesafe.exceptions import VibesafeProviderError, VibesafeValidationError
 
 
+def _fake_provider(complete):
+    """Provider stand-in whose complete() is the given function."""
+    return SimpleNamespace(
+        complete=complete,
+        last_metadata=SimpleNamespace(response_id=None, reasoning_details=None),
+    )
+
+
+def _raise_boom(**kwargs):
+    raise RuntimeError("boom")
+
+
 @pytest.mark.usefixtures("clear_vibesafe_registry")
 class TestCodegenErrors:
     """Ensure CodeGenerator raises SPEC-aligned exceptions."""
 
-    def test_missing_doctest_warns(self, test_config, temp_dir, monkeypatch, mocker):
+    @pytest.fixture(autouse=True)
+    def _install_config(self, test_config, monkeypatch):
+        """Make test_config the global config; test_config already chdirs into its dir."""
+        from vibesafe import config as config_module
+
+        monkeypatch.setattr(config_module, "_config", test_config)
+
+    def test_missing_doctest_warns(self, monkeypatch):
         """Generating a unit without doctests should warn but still proceed."""
-        self._prepare_config(monkeypatch, test_config, temp_dir)
 
         @vibesafe
         def no_doctest(x: int) -> int:
@@ -23,22 +43,26 @@ class TestCodegenErrors:
         unit_id = no_doctest.__vibesafe_unit_id__
         unit_meta = get_unit(unit_id)
 
-        provider = mocker.MagicMock()
-        provider.complete.return_value = "def no_doctest(x: int) -> int:\n    return x"
-        mocker.patch("vibesafe.codegen.get_provider", return_value=provider)
+        prompts: list[str] = []
+
+        def complete(prompt, **kwargs):
+            prompts.append(prompt)
+            return "def no_doctest(x: int) -> int:\n    return x"
+
+        provider = _fake_provider(complete)
+        monkeypatch.setattr("vibesafe.codegen.get_provider", lambda name: provider)
 
         generator = CodeGenerator(unit_id, unit_meta)
-        mocker.patch.object(generator, "_render_prompt", return_value="prompt")
+        monkeypatch.setattr(generator, "_render_prompt", lambda: "prompt")
 
         with pytest.warns(RuntimeWarning, match="does not declare any doctests"):
             checkpoint_info = generator.generate(force=True)
 
         assert checkpoint_info["spec_hash"]
-        provider.complete.assert_called_once()
+        assert len(prompts) == 1
 
-    def test_provider_error_wrapped(self, test_config, temp_dir, monkeypatch, mocker):
+    def test_provider_error_wrapped(self, monkeypatch):
         """Provider failures are wrapped in VibesafeProviderError."""
-        self._prepare_config(monkeypatch, test_config, temp_dir)
 
         @vibesafe
         def has_doctest(x: int) -> int:
@@ -53,19 +77,17 @@ class TestCodegenErrors:
         unit_id = has_doctest.__vibesafe_unit_id__
         unit_meta = get_unit(unit_id)
 
-        mock_provider = mocker.MagicMock()
-        mock_provider.complete.side_effect = RuntimeError("boom")
-        mocker.patch("vibesafe.codegen.get_provider", return_value=mock_provider)
+        provider = _fake_provider(_raise_boom)
+        monkeypatch.setattr("vibesafe.codegen.get_provider", lambda name: provider)
 
         generator = CodeGenerator(unit_id, unit_meta)
-        mocker.patch.object(generator, "_render_prompt", return_value="mock prompt")
+        monkeypatch.setattr(generator, "_render_prompt", lambda: "mock prompt")
 
         with pytest.raises(VibesafeProviderError):
             generator.generate(force=True)
 
-    def test_validation_error_on_missing_function(self, test_config, temp_dir, monkeypatch, mocker):
+    def test_validation_error_on_missing_function(self, monkeypatch):
         """Generated code that omits the expected function triggers VibesafeValidationError."""
-        self._prepare_config(monkeypatch, test_config, temp_dir)
 
         @vibesafe
         def spec_with_doctest(x: int) -> int:
@@ -80,19 +102,11 @@ class TestCodegenErrors:
         unit_id = spec_with_doctest.__vibesafe_unit_id__
         unit_meta = get_unit(unit_id)
 
-        mock_provider = mocker.MagicMock()
-        mock_provider.complete.return_value = "# generated with no function"
-        mocker.patch("vibesafe.codegen.get_provider", return_value=mock_provider)
+        provider = _fake_provider(lambda **kwargs: "# generated with no function")
+        monkeypatch.setattr("vibesafe.codegen.get_provider", lambda name: provider)
 
         generator = CodeGenerator(unit_id, unit_meta)
-        mocker.patch.object(generator, "_render_prompt", return_value="mock prompt")
+        monkeypatch.setattr(generator, "_render_prompt", lambda: "mock prompt")
 
         with pytest.raises(VibesafeValidationError):
             generator.generate(force=True)
-
-    @staticmethod
-    def _prepare_config(monkeypatch, test_config, temp_dir):
-        monkeypatch.chdir(temp_dir)
-        from vibesafe import config as config_module
-
-        config_module._config = test_config
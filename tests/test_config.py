@@ -17,33 +17,94 @@ from vibesafe.config import (
 )
 
 
+@pytest.fixture(scope="module")
+def config_layout(tmp_path_factory: pytest.TempPathFactory) -> tuple[Path, Path, Path]:
+    """Read-only dirs for config discovery: (project root, its subdir, dir without config)."""
+    root = tmp_path_factory.mktemp("config_root")
+    (root / "vibesafe.toml").write_text("[project]\npython = '>=3.12'\n")
+    (root / "subdir").mkdir()
+    return root, root / "subdir", tmp_path_factory.mktemp("no_config")
+
+
+class TestSectionModels:
+    """Defaults and overrides of the per-section config models."""
+
+    @pytest.mark.parametrize(
+        ("model", "expected"),
+        [
+            (
+                ProviderConfig,
+                {
+                    "kind": "openai-compatible",
+                    "model": "gpt-5-mini",
+                    "seed": 42,
+                    "timeout": 60,
+                    "reasoning_effort": None,
+                },
+            ),
+            (
+                PathsConfig,
+                {
+                    "checkpoints": ".vibesafe/checkpoints",
+                    "cache": ".vibesafe/cache",
+                    "index": ".vibesafe/index.toml",
+                    "generated": "__generated__",
+                },
+            ),
+            (
+                PromptsConfig,
+                {
+                    "function": "vibesafe/templates/function.j2",
+                    "http": "vibesafe/templates/http_endpoint.j2",
+                    "cli": "vibesafe/templates/cli_command.j2",
+                },
+            ),
+            (ProjectConfig, {"python": ">=3.12", "env": "dev"}),
+            (SandboxConfig, {"enabled": False, "timeout": 10, "memory_mb": 256}),
+        ],
+        ids=lambda value: value.__name__ if isinstance(value, type) else "",
+    )
+    def test_defaults(self, model, expected):
+        """Each section model has the documented defaults."""
+        config = model()
+        assert {field: getattr(config, field) for field in expected} == expected
+
+    @pytest.mark.parametrize(
+        ("model", "values"),
+        [
+            (
+                ProviderConfig,
+                {
+                    "kind": "custom",
+                    "model": "gpt-4",
+                    "reasoning_effort": "medium",
+                    "seed": 100,
+                    "timeout": 120,
+                },
+            ),
+            (
+                PathsConfig,
+                {
+                    "checkpoints": "custom/checkpoints",
+                    "cache": "custom/cache",
+                    "index": "custom/index.toml",
+                    "generated": "custom/generated",
+                },
+            ),
+            (ProjectConfig, {"env": "prod"}),
+            (SandboxConfig, {"enabled": True, "timeout": 30, "memory_mb": 512}),
+        ],
+        ids=lambda value: value.__name__ if isinstance(value, type) else "",
+    )
+    def test_custom_values(self, model, values):
+        """Explicit values override the defaults unchanged."""
+        config = model(**values)
+        assert {field: getattr(config, field) for field in values} == values
+
+
 class TestProviderConfig:
     """Tests for ProviderConfig."""
 
-    def test_default_values(self):
-        """Test provider config with default values."""
-        config = ProviderConfig()
-        assert config.kind == "openai-compatible"
-        assert config.model == "gpt-5-mini"
-        assert config.seed == 42
-        assert config.timeout == 60
-        assert config.reasoning_effort is None
-
-    def test_custom_values(self):
-        """Test provider config with custom values."""
-        config = ProviderConfig(
-            kind="custom",
-            model="gpt-4",
-            reasoning_effort="medium",
-            seed=100,
-            timeout=120,
-        )
-        assert config.kind == "custom"
-        assert config.model == "gpt-4"
-        assert config.reasoning_effort == "medium"
-        assert config.seed == 100
-        assert config.timeout == 120
-
     def test_reasoning_effort_normalization(self):
         """Reasoning effort accepts allowed values (case-insensitive)."""
         cfg = ProviderConfig(model="gpt-4", reasoning_effort="High")
@@ -54,54 +115,9 @@ class TestProviderConfig:
             ProviderConfig(model="gpt-4", reasoning_effort="extreme")
 
 
-class TestPathsConfig:
-    """Tests for PathsConfig."""
-
-    def test_default_paths(self):
-        """Test default path configuration."""
-        config = PathsConfig()
-        assert config.checkpoints == ".vibesafe/checkpoints"
-        assert config.cache == ".vibesafe/cache"
-        assert config.index == ".vibesafe/index.toml"
-        assert config.generated == "__generated__"
-
-    def test_custom_paths(self):
-        """Test custom path configuration."""
-        config = PathsConfig(
-            checkpoints="custom/checkpoints",
-            cache="custom/cache",
-            index="custom/index.toml",
-            generated="custom/generated",
-        )
-        assert config.checkpoints == "custom/checkpoints"
-        assert config.cache == "custom/cache"
-
-
-class TestPromptsConfig:
-    """Tests for PromptsConfig."""
-
-    def test_default_prompts(self):
-        """Test default prompt paths."""
-        config = PromptsConfig()
-        assert config.function == "vibesafe/templates/function.j2"
-        assert config.http == "vibesafe/templates/http_endpoint.j2"
-        assert config.cli == "vibesafe/templates/cli_command.j2"
-
-
 class TestProjectConfig:
     """Tests for ProjectConfig."""
 
-    def test_default_project(self):
-        """Test default project configuration."""
-        config = ProjectConfig()
-        assert config.python == ">=3.12"
-        assert config.env == "dev"
-
-    def test_prod_env(self):
-        """Test production environment."""
-        config = ProjectConfig(env="prod")
-        assert config.env == "prod"
-
     def test_env_override(self, monkeypatch):
         """Environment variable should override project env."""
         monkeypatch.setenv("VIBESAFE_ENV", "prod")
@@ -122,24 +138,6 @@ class TestProjectConfig:
         assert config.project.env == "prod"
 
 
-class TestSandboxConfig:
-    """Tests for SandboxConfig."""
-
-    def test_default_sandbox(self):
-        """Test default sandbox configuration."""
-        config = SandboxConfig()
-        assert config.enabled is False
-        assert config.timeout == 10
-        assert config.memory_mb == 256
-
-    def test_enabled_sandbox(self):
-        """Test enabled sandbox."""
-        config = SandboxConfig(enabled=True, timeout=30, memory_mb=512)
-        assert config.enabled is True
-        assert config.timeout == 30
-        assert config.memory_mb == 512
-
-
 class TestVibesafeConfig:
     """Tests for VibesafeConfig."""
 
@@ -201,30 +199,32 @@ class TestVibesafeConfig:
         assert resolved.is_absolute()
         assert str(resolved).endswith(rel_path)
 
-    def test_find_config_current_dir(self, temp_dir: Path, monkeypatch: pytest.MonkeyPatch):
+    def test_find_config_current_dir(
+        self, config_layout: tuple[Path, Path, Path], monkeypatch: pytest.MonkeyPatch
+    ):
         """Test finding config in current directory."""
-        config_path = temp_dir / "vibesafe.toml"
-        config_path.write_text("[project]\npython = '>=3.12'\n")
-        monkeypatch.chdir(temp_dir)
+        root, _, _ = config_layout
+        monkeypatch.chdir(root)
 
         found = VibesafeConfig._find_config()
-        assert found == config_path
+        assert found == root / "vibesafe.toml"
 
-    def test_find_config_parent_dir(self, temp_dir: Path, monkeypatch: pytest.MonkeyPatch):
+    def test_find_config_parent_dir(
+        self, config_layout: tuple[Path, Path, Path], monkeypatch: pytest.MonkeyPatch
+    ):
         """Test finding config in parent directory."""
-        config_path = temp_dir / "vibesafe.toml"
-        config_path.write_text("[project]\npython = '>=3.12'\n")
-
-        subdir = temp_dir / "subdir"
-        subdir.mkdir()
+        root, subdir, _ = config_layout
         monkeypatch.chdir(subdir)
 
         found = VibesafeConfig._find_config()
-        assert found == config_path
+        assert found == root / "vibesafe.toml"
 
-    def test_find_config_not_found(self, temp_dir: Path, monkeypatch: pytest.MonkeyPatch):
+    def test_find_config_not_found(
+        self, config_layout: tuple[Path, Path, Path], monkeypatch: pytest.MonkeyPatch
+    ):
         """Test find_config returns None when not found."""
-        monkeypatch.chdir(temp_dir)
+        _, _, empty = config_layout
+        monkeypatch.chdir(empty)
         found = VibesafeConfig._find_config()
         assert found is None
 
@@ -279,3 +279,30 @@ class TestGetConfig:
         monkeypatch.chdir(temp_dir)
         config = get_config(reload=True)
         assert config.project.env == "dev"
+
+    def test_reload_reuses_parse_until_file_changes(
+        self, config_file: Path, monkeypatch: pytest.MonkeyPatch
+    ):
+        """Reloading an unchanged vibesafe.toml skips the TOML parse but builds fresh models."""
+        from vibesafe import config as config_module
+
+        monkeypatch.chdir(config_file.parent)
+        monkeypatch.setattr(config_module, "_TOML_CACHE", {})
+        parses = []
+        real_loads = config_module.tomllib.loads
+
+        def counting_loads(text):
+            parses.append(text)
+            return real_loads(text)
+
+        monkeypatch.setattr(config_module.tomllib, "loads", counting_loads)
+
+        first = get_config(reload=True)
+        second = get_config(reload=True)
+        assert len(parses) == 1
+        assert first.paths is not second.paths
+
+        # Same size and, on coarse filesystems, possibly the same mtime.
+        config_file.write_text(config_file.read_text().replace("gpt-4o-mini", "gpt-4o-mega"))
+        assert get_config(reload=True).get_provider().model == "gpt-4o-mega"
+        assert len(parses) == 2
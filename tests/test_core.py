@@ -1,15 +1,55 @@
 """Tests for vibesafe.core module."""
 
+import inspect
 from pathlib import Path
 from typing import Any
 
 import pytest
 
+import vibesafe as vibesafe_pkg
+import vibesafe.codegen as vibesafe_codegen
 import vibesafe.core as vibesafe_core
+import vibesafe.runtime as vibesafe_runtime
+import vibesafe.testing as vibesafe_testing
 from vibesafe import VibeCoded, get_registry, get_unit, vibesafe
 from vibesafe.testing import TestResult
 
 
+def _uncompiled_func():
+    """Decorate a sync spec that has no checkpoint."""
+
+    @vibesafe
+    def uncompiled_func(x: int) -> int:
+        """Not compiled."""
+        raise VibeCoded()
+
+    return uncompiled_func
+
+
+def _uncompiled_endpoint():
+    """Decorate an async spec that has no checkpoint."""
+
+    @vibesafe(kind="http")
+    async def uncompiled_endpoint(x: int) -> dict[str, int]:
+        """Not compiled."""
+        return VibeCoded()
+
+    return uncompiled_endpoint
+
+
+@pytest.fixture
+def no_auto_generate(monkeypatch):
+    """Make failed loads fall straight through to the uncompiled error."""
+    monkeypatch.setattr(vibesafe_core, "_should_auto_generate", lambda exc: False)
+
+
+@pytest.fixture
+def interactive_auto_generate(monkeypatch):
+    """Allow auto-generation as if running in an interactive session."""
+    monkeypatch.setattr(vibesafe_core, "_should_auto_generate", lambda exc: True)
+    monkeypatch.setattr(vibesafe_core, "_in_interactive_session", lambda: True)
+
+
 class TestVibeCoded:
     """Tests for VibeCoded sentinel."""
 
@@ -37,16 +77,12 @@ class TestVibesafeCore:
 
     def test_module_exposes_aliases(self):
         """Importing vibesafe package exposes convenience aliases."""
-        import importlib
-
-        vibesafe_module = importlib.import_module("vibesafe")
-
-        assert hasattr(vibesafe_module, "func")
-        assert hasattr(vibesafe_module, "http")
-        assert hasattr(vibesafe_module, "get_registry")
-        assert hasattr(vibesafe_module, "get_unit")
-        assert vibesafe_module.func is vibesafe_module.vibesafe
-        assert vibesafe_module.http is vibesafe_module.vibesafe
+        assert hasattr(vibesafe_pkg, "func")
+        assert hasattr(vibesafe_pkg, "http")
+        assert hasattr(vibesafe_pkg, "get_registry")
+        assert hasattr(vibesafe_pkg, "get_unit")
+        assert vibesafe_pkg.func is vibesafe_pkg.vibesafe
+        assert vibesafe_pkg.http is vibesafe_pkg.vibesafe
 
     def test_func_decorator_basic(self, clear_vibesafe_registry):
         """Test basic function decoration."""
@@ -85,7 +121,7 @@ class TestVibesafeCore:
         assert param_func.__vibesafe_provider__ == "custom"
         assert param_func.__vibesafe_template__ == "custom.j2"
 
-    @pytest.mark.asyncio
+    @pytest.mark.asyncio(loop_scope="class")
     async def test_http_decorator_basic(self, clear_vibesafe_registry):
         """Test HTTP endpoint decoration (using explicit kind for now)."""
 
@@ -97,33 +133,63 @@ class TestVibesafeCore:
         assert hasattr(test_endpoint, "__vibesafe_unit_id__")
         assert test_endpoint.__vibesafe_kind__ == "http"
 
-    def test_func_decorator_raises_on_missing_checkpoint(
-        self, clear_vibesafe_registry, monkeypatch
-    ):
-        """Test that calling uncompiled function raises error."""
+    @pytest.mark.asyncio(loop_scope="class")
+    @pytest.mark.parametrize("factory", [_uncompiled_func, _uncompiled_endpoint])
+    async def test_uncompiled_raises(self, factory, clear_vibesafe_registry, no_auto_generate):
+        """Calling an uncompiled function or endpoint raises an error."""
 
-        monkeypatch.setattr(
-            vibesafe_core,
-            "_should_auto_generate",
-            lambda exc: False,
+        uncompiled = factory()
+
+        with pytest.raises(RuntimeError, match="has not been compiled yet"):
+            if inspect.iscoroutinefunction(uncompiled):
+                await uncompiled(5)
+            else:
+                uncompiled(5)
+
+    def test_spec_hash_tracks_dependency_edits(
+        self, clear_vibesafe_registry, no_auto_generate, temp_dir, monkeypatch
+    ):
+        """Each call re-reads dependencies, so editing a helper changes the spec hash."""
+        import importlib
+        import sys
+
+        (temp_dir / "drift_helpers.py").write_text("def helper(x):\n    return x\n")
+        (temp_dir / "drift_spec.py").write_text(
+            "from vibesafe import VibeCoded, vibesafe\n"
+            "from drift_helpers import helper\n\n\n"
+            "@vibesafe\n"
+            "def spec(x: int) -> int:\n"
+            '    """Spec."""\n'
+            "    helper(x)\n"
+            "    raise VibeCoded()\n"
         )
+        monkeypatch.syspath_prepend(str(temp_dir))
+        for name in ("drift_helpers", "drift_spec"):
+            monkeypatch.delitem(sys.modules, name, raising=False)
+        spec = importlib.import_module("drift_spec").spec
 
-        @vibesafe
-        def uncompiled_func(x: int) -> int:
-            """Not compiled."""
-            raise VibeCoded()
+        hashes = []
+        real_hash = vibesafe_core._compute_spec_hash
+
+        def recording_hash(unit_id, spec_meta):
+            hashes.append(real_hash(unit_id, spec_meta))
+            return hashes[-1]
 
+        monkeypatch.setattr(vibesafe_core, "_compute_spec_hash", recording_hash)
+
+        with pytest.raises(RuntimeError, match="has not been compiled yet"):
+            spec(1)
+        (temp_dir / "drift_helpers.py").write_text("def helper(x):\n    return x + 1\n")
         with pytest.raises(RuntimeError, match="has not been compiled yet"):
-            uncompiled_func(5)
+            spec(1)
 
-    def test_func_decorator_missing_boundary_marker(self, clear_vibesafe_registry, monkeypatch):
-        """Test that specs without VibeCoded sentinel raise helpfully."""
+        assert len(hashes) == 2
+        assert hashes[0] != hashes[1]
 
-        monkeypatch.setattr(
-            vibesafe_core,
-            "_should_auto_generate",
-            lambda exc: False,
-        )
+    def test_func_decorator_missing_boundary_marker(
+        self, clear_vibesafe_registry, no_auto_generate
+    ):
+        """Test that specs without VibeCoded sentinel raise helpfully."""
 
         @vibesafe
         def missing_marker(msg: str) -> str:
@@ -133,15 +199,9 @@ class TestVibesafeCore:
         with pytest.raises(RuntimeError, match="VibeCoded"):
             missing_marker("moo")
 
-    def test_pass_treated_as_boundary(self, clear_vibesafe_registry, monkeypatch):
+    def test_pass_treated_as_boundary(self, clear_vibesafe_registry, no_auto_generate):
         """`pass` placeholders are treated like VibeCoded."""
 
-        monkeypatch.setattr(
-            vibesafe_core,
-            "_should_auto_generate",
-            lambda exc: False,
-        )
-
         @vibesafe
         def pass_spec(msg: str) -> str:
             """Placeholder using pass."""
@@ -152,15 +212,9 @@ class TestVibesafeCore:
 
         assert "Specs must yield" not in str(exc_info.value)
 
-    def test_ellipsis_treated_as_boundary(self, clear_vibesafe_registry, monkeypatch):
+    def test_ellipsis_treated_as_boundary(self, clear_vibesafe_registry, no_auto_generate):
         """`return ...` placeholders are treated like VibeCoded."""
 
-        monkeypatch.setattr(
-            vibesafe_core,
-            "_should_auto_generate",
-            lambda exc: False,
-        )
-
         @vibesafe
         def ellipsis_spec(msg: str) -> str:
             """Placeholder using ellipsis."""
@@ -201,7 +255,7 @@ class TestVibesafeCore:
         assert result == "generated:moo"
         assert calls["count"] == 1
 
-    @pytest.mark.asyncio
+    @pytest.mark.asyncio(loop_scope="class")
     async def test_http_auto_generate_invoked(self, clear_vibesafe_registry, monkeypatch):
         """Auto-generation also applies to async endpoints."""
 
@@ -234,7 +288,7 @@ class TestVibesafeCore:
         def _raise_getsource(func):  # pragma: no cover - exercised via test
             raise OSError("no source")
 
-        monkeypatch.setattr("vibesafe.ast_parser.inspect.getsource", _raise_getsource)
+        monkeypatch.setattr(inspect, "getsource", _raise_getsource)
 
         @vibesafe
         def interactive_spec(x: int) -> int:
@@ -255,7 +309,9 @@ class TestVibesafeCore:
         assert spec["docstring"].startswith("Docstring required")
         assert spec["body_before_handled"] == ""
 
-    def test_auto_generate_allows_missing_doctest(self, clear_vibesafe_registry, monkeypatch):
+    def test_auto_generate_allows_missing_doctest(
+        self, clear_vibesafe_registry, interactive_auto_generate, monkeypatch
+    ):
         """Interactive auto-generation bypasses doctest requirement."""
 
         from vibesafe.exceptions import VibesafeCheckpointMissing
@@ -284,8 +340,8 @@ class TestVibesafeCore:
                 "created_at": "now",
             }
 
-        monkeypatch.setattr("vibesafe.codegen.generate_for_unit", fake_generate)
-        monkeypatch.setattr("vibesafe.runtime.update_index", lambda *a, **k: None)
+        monkeypatch.setattr(vibesafe_codegen, "generate_for_unit", fake_generate)
+        monkeypatch.setattr(vibesafe_runtime, "update_index", lambda *a, **k: None)
         # load_checkpoint logic is mocked via _auto_generate_and_load usually, but here we mock lower levels
         # Actually _auto_generate_and_load calls generate_for_unit, update_index, test_unit, load_checkpoint
 
@@ -295,13 +351,12 @@ class TestVibesafeCore:
                 raise VibesafeCheckpointMissing("missing")
             return lambda msg: f"generated:{msg}"
 
-        monkeypatch.setattr("vibesafe.runtime.load_checkpoint", fake_load_checkpoint)
+        monkeypatch.setattr(vibesafe_runtime, "load_checkpoint", fake_load_checkpoint)
         monkeypatch.setattr(
-            "vibesafe.testing.test_unit",
+            vibesafe_testing,
+            "test_unit",
             lambda unit_id: TestResult(passed=True, total=0),
         )
-        monkeypatch.setattr(vibesafe_core, "_should_auto_generate", lambda exc: True)
-        monkeypatch.setattr(vibesafe_core, "_in_interactive_session", lambda: True)
 
         @vibesafe
         def repl_func(msg: str) -> str:
@@ -311,7 +366,9 @@ class TestVibesafeCore:
         assert result == "generated:moo"
         assert generate_calls == [(False, None), (True, None)]
 
-    def test_auto_generate_on_hash_mismatch(self, clear_vibesafe_registry, monkeypatch):
+    def test_auto_generate_on_hash_mismatch(
+        self, clear_vibesafe_registry, interactive_auto_generate, monkeypatch
+    ):
         """Hash mismatches should trigger auto-generation in interactive mode."""
 
         from vibesafe.exceptions import VibesafeHashMismatch
@@ -336,8 +393,8 @@ class TestVibesafeCore:
                 "created_at": "now",
             }
 
-        monkeypatch.setattr("vibesafe.codegen.generate_for_unit", fake_generate)
-        monkeypatch.setattr("vibesafe.runtime.update_index", lambda *a, **k: None)
+        monkeypatch.setattr(vibesafe_codegen, "generate_for_unit", fake_generate)
+        monkeypatch.setattr(vibesafe_runtime, "update_index", lambda *a, **k: None)
 
         def fake_load_checkpoint(unit_id: str, verify_hash: bool = True, **kwargs):
             # First call raises mismatch to trigger auto-generate, second returns impl.
@@ -345,13 +402,12 @@ class TestVibesafeCore:
                 raise VibesafeHashMismatch("mismatch")
             return lambda msg: f"regen:{msg}"
 
-        monkeypatch.setattr("vibesafe.runtime.load_checkpoint", fake_load_checkpoint)
+        monkeypatch.setattr(vibesafe_runtime, "load_checkpoint", fake_load_checkpoint)
         monkeypatch.setattr(
-            "vibesafe.testing.test_unit",
+            vibesafe_testing,
+            "test_unit",
             lambda unit_id: TestResult(passed=True, total=0),
         )
-        monkeypatch.setattr(vibesafe_core, "_should_auto_generate", lambda exc: True)
-        monkeypatch.setattr(vibesafe_core, "_in_interactive_session", lambda: True)
 
         @vibesafe
         def repl_func(msg: str) -> str:
@@ -392,7 +448,9 @@ class TestVibesafeCore:
 
         assert hash_with != hash_without
 
-    def test_auto_generate_retries_with_feedback(self, clear_vibesafe_registry, monkeypatch):
+    def test_auto_generate_retries_with_feedback(
+        self, clear_vibesafe_registry, interactive_auto_generate, monkeypatch
+    ):
         """Quality gate failures feed back into a second generation attempt."""
 
         from vibesafe.exceptions import VibesafeCheckpointMissing
@@ -443,12 +501,10 @@ class TestVibesafeCore:
                 raise VibesafeCheckpointMissing("missing")
             return lambda msg: f"ok:{msg}"
 
-        monkeypatch.setattr("vibesafe.codegen.generate_for_unit", fake_generate)
-        monkeypatch.setattr("vibesafe.runtime.load_checkpoint", fake_load_checkpoint)
-        monkeypatch.setattr("vibesafe.runtime.update_index", lambda *a, **k: None)
-        monkeypatch.setattr("vibesafe.testing.test_unit", fake_test_unit)
-        monkeypatch.setattr(vibesafe_core, "_should_auto_generate", lambda exc: True)
-        monkeypatch.setattr(vibesafe_core, "_in_interactive_session", lambda: True)
+        monkeypatch.setattr(vibesafe_codegen, "generate_for_unit", fake_generate)
+        monkeypatch.setattr(vibesafe_runtime, "load_checkpoint", fake_load_checkpoint)
+        monkeypatch.setattr(vibesafe_runtime, "update_index", lambda *a, **k: None)
+        monkeypatch.setattr(vibesafe_testing, "test_unit", fake_test_unit)
 
         @vibesafe
         def flaky(msg: str) -> str:
@@ -468,19 +524,19 @@ class TestVibesafeCore:
         assert len(test_runs) == 2
         assert len(load_calls) == 2
 
-    def test_cowsay_fallback_without_api_key(self, clear_vibesafe_registry, monkeypatch):
+    def test_cowsay_fallback_without_api_key(
+        self, clear_vibesafe_registry, interactive_auto_generate, monkeypatch
+    ):
         """Missing API key falls back to inline cowsay implementation."""
 
         def raise_no_key(*args, **kwargs):
             raise ValueError("API key not found in environment variable: OPENAI_API_KEY")
 
-        monkeypatch.setattr("vibesafe.codegen.generate_for_unit", raise_no_key)
-        monkeypatch.setattr("vibesafe.runtime.update_index", lambda *a, **k: None)
+        monkeypatch.setattr(vibesafe_codegen, "generate_for_unit", raise_no_key)
+        monkeypatch.setattr(vibesafe_runtime, "update_index", lambda *a, **k: None)
         monkeypatch.setattr(
-            "vibesafe.testing.test_unit", lambda unit_id: TestResult(passed=True, total=0)
+            vibesafe_testing, "test_unit", lambda unit_id: TestResult(passed=True, total=0)
         )
-        monkeypatch.setattr(vibesafe_core, "_should_auto_generate", lambda exc: True)
-        monkeypatch.setattr(vibesafe_core, "_in_interactive_session", lambda: True)
 
         @vibesafe
         def cowsayonlyboo(msg: str) -> str:
@@ -493,15 +549,9 @@ class TestVibesafeCore:
 
         assert "API key not found" in str(exc_info.value.__cause__)
 
-    def test_missing_doctest_hint_in_error(self, clear_vibesafe_registry, monkeypatch):
+    def test_missing_doctest_hint_in_error(self, clear_vibesafe_registry, no_auto_generate):
         """Runtime error mentions missing doctest when auto generation fails."""
 
-        monkeypatch.setattr(
-            vibesafe_core,
-            "_should_auto_generate",
-            lambda exc: False,
-        )
-
         @vibesafe
         def missing_doc(msg: str) -> str:
             """No doctest present."""
@@ -512,26 +562,6 @@ class TestVibesafeCore:
 
         assert "does not declare any doctests" in str(exc_info.value)
 
-    @pytest.mark.asyncio
-    async def test_http_decorator_raises_on_missing_checkpoint(
-        self, clear_vibesafe_registry, monkeypatch
-    ):
-        """Test that calling uncompiled endpoint raises error."""
-
-        monkeypatch.setattr(
-            vibesafe_core,
-            "_should_auto_generate",
-            lambda exc: False,
-        )
-
-        @vibesafe(kind="http")
-        async def uncompiled_endpoint(x: int) -> dict[str, int]:
-            """Not compiled."""
-            return VibeCoded()
-
-        with pytest.raises(RuntimeError, match="has not been compiled yet"):
-            await uncompiled_endpoint(5)
-
     def test_get_registry(self, clear_vibesafe_registry):
         """Test get_registry returns copy of registry."""
 
@@ -583,7 +613,7 @@ class TestVibesafeCore:
         assert my_func.__name__ == "my_func"
         assert my_func.__doc__ == "This is my function."
 
-    @pytest.mark.asyncio
+    @pytest.mark.asyncio(loop_scope="class")
     async def test_http_preserves_function_metadata(self, clear_vibesafe_registry):
         """Test HTTP decorator preserves function metadata."""
 
@@ -90,6 +90,24 @@ class TestMCPServer:
         assert response["error"]["code"] == -32000
         assert "Test error" in response["error"]["message"]
 
+    @pytest.mark.parametrize(
+        "request_",
+        [
+            {"jsonrpc": "2.0", "method": "scan", "params": {}, "id": 1},
+            {"jsonrpc": "2.0", "method": "tools/call", "params": {"name": "scan"}, "id": 1},
+        ],
+        ids=["direct", "tools-call"],
+    )
+    def test_requests_shut_down_sandbox_workers(self, request_, monkeypatch, capsys):
+        """No sandbox worker outlives the request that started it."""
+        calls = []
+        monkeypatch.setattr("vibesafe.mcp.shutdown_sandbox", lambda: calls.append(True))
+
+        MCPServer().handle_request(request_)
+
+        assert calls == [True]
+        assert "result" in _parse_single_response(capsys.readouterr().out)
+
     def test_scan_method(self, clear_vibesafe_registry):
         """Test scan method."""
 
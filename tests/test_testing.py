@@ -2,6 +2,10 @@
 Tests for vibesafe.testing module.
 """
 
+from pathlib import Path
+
+import pytest
+
 from vibesafe import VibeCoded, vibesafe
 from vibesafe.testing import TestResult, test_checkpoint, test_unit
 
@@ -56,7 +60,7 @@ class TestTestCheckpoint:
         assert "Implementation file not found" in result.errors[0]
 
     def test_checkpoint_no_doctests_passes(
-        self, checkpoint_dir, sample_impl, clear_vibesafe_registry
+        self, checkpoint_dir, sample_impl, test_config, clear_vibesafe_registry
     ):
         """Test checkpoint with no doctests passes."""
 
@@ -75,7 +79,7 @@ class TestTestCheckpoint:
         assert result.total == 0
 
     def test_checkpoint_with_passing_doctests(
-        self, checkpoint_dir, sample_impl, clear_vibesafe_registry
+        self, checkpoint_dir, sample_impl, test_config, clear_vibesafe_registry
     ):
         """Test checkpoint with passing doctests."""
 
@@ -99,6 +103,28 @@ class TestTestCheckpoint:
         # Note: May fail if impl doesn't match, depends on sample_impl
         assert isinstance(result, TestResult)
 
+    def test_spec_extracted_once_per_function(self, monkeypatch, sample_function):
+        """Repeated checkpoint tests reuse the parsed spec of the same function."""
+        from vibesafe import ast_parser, testing
+
+        built = []
+        real_extractor = ast_parser.SpecExtractor
+
+        def counting_extractor(func):
+            built.append(func)
+            return real_extractor(func)
+
+        monkeypatch.setattr(ast_parser, "SpecExtractor", counting_extractor)
+        monkeypatch.delattr(sample_function, "__vibesafe_extractor__", raising=False)
+
+        first = testing._check_spec(sample_function)
+        second = testing._check_spec(sample_function)
+
+        assert first == second
+        assert set(first) == {"docstring", "doctests", "hypothesis_blocks"}
+        assert len(first["doctests"]) == 2
+        assert len(built) == 1
+
     def test_checkpoint_gates_failure(self, checkpoint_dir, clear_vibesafe_registry, monkeypatch):
         """Gate failures should surface as test failures."""
 
@@ -128,7 +154,7 @@ def gated_func(a: int) -> int:
 
         monkeypatch.setattr(
             "vibesafe.testing._run_quality_gates",
-            lambda path: ["ruff failed: example"],
+            lambda path, config=None: ["ruff failed: example"],
         )
 
         result = test_checkpoint(checkpoint_dir, unit_meta)
@@ -185,16 +211,16 @@ def doc_func(msg: str) -> str:
         # Aggregated harnesses only materialize in prod mode
         test_config.project.env = "prod"
 
-        monkeypatch.setattr("vibesafe.testing._run_quality_gates", lambda path: [])
+        monkeypatch.setattr("vibesafe.testing._run_quality_gates", lambda path, config=None: [])
 
         unit_id = unit_meta["module"] + "/" + unit_meta["qualname"]
-        harness_path = (
-            temp_dir / "tests" / "vibesafe" / f"test_{unit_meta['module'].replace('.', '_')}.py"
-        )
+        harness_dir = temp_dir / "tests" / "vibesafe"
+        cases_path = harness_dir / f"cases_{unit_meta['module'].replace('.', '_')}.json"
         result = test_checkpoint(checkpoint_dir, unit_meta)
 
-        assert harness_path.exists()
-        contents = harness_path.read_text()
+        assert (harness_dir / "test_vibesafe_harness.py").exists()
+        assert cases_path.exists()
+        contents = cases_path.read_text()
         assert unit_id in contents
         assert "hi" in contents
 
@@ -208,6 +234,252 @@ def doc_func(msg: str) -> str:
             assert not result.passed
             assert "No module named 'hypothesis'" in result.errors[0]
 
+    def test_unchanged_passing_checkpoint_skips_checks(
+        self, checkpoint_dir, temp_dir, test_config, clear_vibesafe_registry, monkeypatch
+    ):
+        """A recorded pass is reused until the implementation changes."""
+        import subprocess
+
+        from vibesafe import config as config_module
+        from vibesafe import testing
+
+        monkeypatch.chdir(temp_dir)
+        config_module._config = test_config
+        monkeypatch.setattr(testing, "_gate_tool_versions", lambda: ("ruff 1", "ty 1"))
+        monkeypatch.setattr(
+            "vibesafe.testing.subprocess.run",
+            lambda cmd, **kwargs: subprocess.CompletedProcess(cmd, 0, "[]", ""),
+        )
+        checks: list[str] = []
+        real_run_checks = testing._run_checks
+
+        def counting_run_checks(impl_path, key, spec, config=None):
+            checks.append(key.unit_id)
+            return real_run_checks(impl_path, key, spec, config)
+
+        monkeypatch.setattr(testing, "_run_checks", counting_run_checks)
+
+        @vibesafe
+        def inc(x: int) -> int:
+            """
+            >>> inc(1)
+            2
+            """
+            raise VibeCoded()
+
+        impl_path = checkpoint_dir / "impl.py"
+        impl_path.write_text("def inc(x: int) -> int:\n    return x + 1\n")
+        unit_meta = {"func": inc, "module": inc.__module__, "qualname": "inc"}
+
+        first = test_checkpoint(checkpoint_dir, unit_meta)
+        second = test_checkpoint(checkpoint_dir, unit_meta)
+        assert first.passed and second.passed
+        assert second.total == first.total == 1
+        assert len(checks) == 1
+        assert sorted(path.name for path in checkpoint_dir.iterdir()) == ["impl.py"]
+        assert testing._pass_record(impl_path, test_config).exists()
+
+        impl_path.write_text("def inc(x: int) -> int:\n    return x + 2\n")
+        assert not test_checkpoint(checkpoint_dir, unit_meta).passed
+        assert len(checks) == 2
+
+    def test_recorded_pass_rechecked_after_gate_config_change(
+        self, checkpoint_dir, temp_dir, test_config, clear_vibesafe_registry, monkeypatch
+    ):
+        """Editing the ruff config between runs re-runs the gates despite a recorded pass."""
+        import json
+        import subprocess
+
+        from vibesafe import config as config_module
+        from vibesafe import testing
+
+        monkeypatch.chdir(temp_dir)
+        config_module._config = test_config
+        monkeypatch.setattr(testing, "_gate_tool_versions", lambda: ("ruff 1", "ty 1"))
+        ruff_config = temp_dir / "ruff.toml"
+        ruff_config.write_text('[lint]\nselect = ["F"]\n')
+
+        def fake_run(cmd, **kwargs):
+            if cmd[0] == "ruff" and "E741" in ruff_config.read_text():
+                diag = {
+                    "filename": str(checkpoint_dir / "impl.py"),
+                    "code": "E741",
+                    "message": "Ambiguous variable name: `l`",
+                    "location": {"row": 2, "column": 5},
+                }
+                return subprocess.CompletedProcess(cmd, 1, json.dumps([diag]), "")
+            return subprocess.CompletedProcess(cmd, 0, "[]", "")
+
+        monkeypatch.setattr("vibesafe.testing.subprocess.run", fake_run)
+
+        @vibesafe
+        def ident(x: int) -> int:
+            """
+            >>> ident(1)
+            1
+            """
+            raise VibeCoded()
+
+        impl_path = checkpoint_dir / "impl.py"
+        impl_path.write_text("def ident(x: int) -> int:\n    l = x\n    return l\n")
+        unit_meta = {"func": ident, "module": ident.__module__, "qualname": "ident"}
+
+        assert test_checkpoint(checkpoint_dir, unit_meta).passed
+
+        ruff_config.write_text('[lint]\nselect = ["F", "E741"]\n')
+        result = test_checkpoint(checkpoint_dir, unit_meta)
+        assert not result.passed
+        assert result.errors == ["ruff failed: impl.py:2:5: E741 Ambiguous variable name: `l`"]
+
+    def test_recorded_pass_keyed_on_sandbox_settings(self, sample_impl, monkeypatch):
+        """A pass recorded under one sandbox setting is not reused under another."""
+        from vibesafe import testing
+        from vibesafe.config import SandboxConfig
+
+        monkeypatch.setattr(testing, "_gate_tool_versions", lambda: ("ruff 1", "ty 1"))
+        spec = {"docstring": "", "hypothesis_blocks": []}
+
+        keys = {
+            testing._pass_key(sample_impl, spec, sandbox)
+            for sandbox in (
+                SandboxConfig(),
+                SandboxConfig(enabled=True),
+                SandboxConfig(enabled=True, memory_mb=512),
+                SandboxConfig(enabled=True, timeout=30),
+            )
+        }
+
+        assert len(keys) == 4
+
+    def test_impl_module_reused_until_file_changes(self, checkpoint_dir):
+        """Loading the same unchanged impl twice does not re-execute it."""
+        from vibesafe.testing import _load_impl_func, _UnitKey
+
+        impl_path = checkpoint_dir / "impl.py"
+        impl_path.write_text(
+            "from dataclasses import dataclass\n\n\n"
+            "@dataclass\nclass Box:\n    value: int\n\n\n"
+            "def boxed(x: int) -> int:\n    return Box(x).value\n"
+        )
+        key = _UnitKey("cache.mod/boxed", "boxed")
+
+        first = _load_impl_func(impl_path, key)
+        assert first(3) == 3
+        assert _load_impl_func(impl_path, key) is first
+
+        impl_path.write_text("def boxed(x: int) -> int:\n    return x + 1\n")
+        reloaded = _load_impl_func(impl_path, key)
+        assert reloaded is not first
+        assert reloaded(3) == 4
+
+    def test_property_blocks_compiled_once(self):
+        """Property sources compile once per unit and keep their source for tracebacks."""
+        import linecache
+
+        from vibesafe.testing import _compile_properties
+
+        source = "def prop():\n    raise ValueError('boom')\n"
+        code = _compile_properties("cache.mod/prop", source)
+
+        assert _compile_properties("cache.mod/prop", source) is code
+        assert _compile_properties("cache.mod/prop", source + "\n") is not code
+        assert linecache.getline(code.co_filename, 2).strip() == "raise ValueError('boom')"
+
+    def test_properties_run_under_stable_module_name(self):
+        """Inline property functions get a per-unit module name and retrievable source."""
+        from vibesafe.testing import _run_hypothesis_inline
+
+        block = (
+            "import inspect\n"
+            "from hypothesis import given, strategies as st\n\n"
+            "@given(st.just(1))\n"
+            "def test_named(x):\n"
+            "    assert test_named.__module__ == 'vibesafe._props.cache_mod_named'\n"
+            "    assert 'def test_named' in inspect.getsource(test_named.hypothesis.inner_test)\n"
+        )
+
+        executed, errors = _run_hypothesis_inline("cache.mod/named", lambda: None, [block])
+
+        assert executed == 1
+        assert errors == []
+
+    def test_module_harness_rewrite_skipped_when_unchanged(self, temp_dir, monkeypatch):
+        """Identical harness cases are not rewritten unless the file changed on disk."""
+        import os
+
+        from vibesafe import testing
+
+        monkeypatch.chdir(temp_dir)
+        monkeypatch.setattr(testing, "_HARNESS_WRITES", {})
+        monkeypatch.setitem(
+            testing._MODULE_TEST_SPECS,
+            "pkg.mod",
+            {"pkg.mod/f": testing._UnitSpec("f", ">>> f()\n1", "", "pkg/mod.py", [])},
+        )
+
+        harness_path = testing._write_module_harness("pkg.mod")
+        original = harness_path.read_text()
+        stat = harness_path.stat()
+
+        # Tamper without moving mtime: the cached digest short-circuits the write.
+        harness_path.write_text("# edited\n")
+        os.utime(harness_path, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+        testing._write_module_harness("pkg.mod")
+        assert harness_path.read_text() == "# edited\n"
+
+        # Once mtime moves, the harness is restored.
+        os.utime(harness_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+        testing._write_module_harness("pkg.mod")
+        assert harness_path.read_text() == original
+
+    def test_module_harness_recreates_removed_directory(self, temp_dir, monkeypatch):
+        """Writes survive the harness directory vanishing and leave no temp files."""
+        import shutil
+
+        from vibesafe import testing
+
+        monkeypatch.chdir(temp_dir)
+        monkeypatch.setattr(testing, "_HARNESS_WRITES", {})
+        monkeypatch.setattr(testing, "_HARNESS_DIRS", set())
+        monkeypatch.setitem(
+            testing._MODULE_TEST_SPECS,
+            "pkg.mod",
+            {"pkg.mod/f": testing._UnitSpec("f", ">>> f()\n1", "", "pkg/mod.py", [])},
+        )
+
+        harness_path = testing._write_module_harness("pkg.mod")
+        shutil.rmtree(harness_path.parent)
+        testing._write_module_harness("pkg.mod")
+
+        assert harness_path.exists()
+        assert sorted(p.name for p in harness_path.parent.iterdir()) == [
+            harness_path.name,
+            testing._HARNESS_RUNNER_NAME,
+        ]
+
+    def test_module_harness_replaces_legacy_module_file(self, temp_dir, monkeypatch):
+        """Per-module .py harnesses from earlier versions are removed, user files kept."""
+        from vibesafe import testing
+
+        monkeypatch.chdir(temp_dir)
+        monkeypatch.setattr(testing, "_HARNESS_WRITES", {})
+        monkeypatch.setitem(
+            testing._MODULE_TEST_SPECS,
+            "pkg.mod",
+            {"pkg.mod/f": testing._UnitSpec("f", ">>> f()\n1", "", "pkg/mod.py", [])},
+        )
+        harness_dir = temp_dir / "tests" / "vibesafe"
+        harness_dir.mkdir(parents=True)
+        legacy = harness_dir / "test_pkg_mod.py"
+        legacy.write_text('"""Auto-generated doctest/property harness for module pkg.mod."""\n')
+        own = harness_dir / "test_other.py"
+        own.write_text('"""Hand-written."""\n')
+
+        testing._write_module_harness("pkg.mod")
+
+        assert not legacy.exists()
+        assert own.exists()
+
     def test_checkpoint_uses_sandbox(
         self,
         checkpoint_dir,
@@ -240,18 +512,586 @@ def doc_func(msg: str) -> str:
 
         sandbox_called = {"called": False}
 
-        def fake_sandbox(unit_meta, spec, sandbox_cfg):
+        def fake_sandbox(key, spec, sandbox_cfg, impl_path=None):
             sandbox_called["called"] = True
             return TestResult(passed=True, total=0)
 
         monkeypatch.setattr("vibesafe.testing._run_sandbox_checks", fake_sandbox)
-        monkeypatch.setattr("vibesafe.testing._run_quality_gates", lambda path: [])
+        monkeypatch.setattr("vibesafe.testing._run_quality_gates", lambda path, config=None: [])
 
         result = test_checkpoint(checkpoint_dir, unit_meta)
         assert result.passed
         assert sandbox_called["called"]
 
 
+class TestRunDoctests:
+    """Tests for the in-process doctest runner."""
+
+    def test_shared_runner_reports_per_run_counts(self):
+        """Reusing the shared runner must not leak counts between units."""
+        import doctest
+
+        from vibesafe.testing import _run_doctests
+
+        def double(x: int) -> int:
+            return x * 2
+
+        docstring = ">>> double(2)\n4\n>>> double(3)\n7"
+        examples = doctest.DocTestParser().get_examples(docstring)
+
+        first = _run_doctests(double, docstring, examples)
+        second = _run_doctests(double, docstring, examples)
+
+        for result in (first, second):
+            assert not result.passed
+            assert result.failures == 1
+            assert result.total == 2
+
+    def test_harness_runner_reports_doctest_diff(self):
+        """The generated harness surfaces doctest output in the assertion message."""
+        import pytest
+
+        from vibesafe.testing import _HARNESS_RUNNER
+
+        namespace: dict = {"__file__": "/nonexistent/test_vibesafe_harness.py"}
+        exec(compile(_HARNESS_RUNNER, "<harness>", "exec"), namespace)
+
+        meta = {"func_name": "double", "docstring": ">>> double(3)\n7"}
+        with pytest.raises(AssertionError) as excinfo:
+            namespace["_run_doctests"]("pkg/double", lambda x: x * 2, meta)
+
+        message = str(excinfo.value)
+        assert "Expected:" in message
+        assert "Got:" in message
+
+    def test_harness_loads_each_unit_once(self):
+        """Rerunning a case reuses the implementation loaded the first time."""
+        from vibesafe.testing import _HARNESS_RUNNER
+
+        namespace: dict = {"__file__": "/nonexistent/test_vibesafe_harness.py"}
+        exec(compile(_HARNESS_RUNNER, "<harness>", "exec"), namespace)
+        namespace["MODULE_CASES"] = {"pkg/f": {"func_name": "f", "docstring": ">>> f(1)\n1"}}
+        loads: list[str] = []
+
+        def fake_load(unit_id):
+            loads.append(unit_id)
+            return lambda x: x
+
+        namespace["load_checkpoint"] = fake_load
+
+        namespace["test_doctests_and_properties"]("pkg/f")
+        namespace["test_doctests_and_properties"]("pkg/f")
+
+        assert loads == ["pkg/f"]
+
+    def test_harness_runner_shared_across_cases(self):
+        """One runner serves every case without carrying failures between them."""
+        import pytest
+
+        from vibesafe.testing import _HARNESS_RUNNER
+
+        namespace: dict = {"__file__": "/nonexistent/test_vibesafe_harness.py"}
+        exec(compile(_HARNESS_RUNNER, "<harness>", "exec"), namespace)
+        runner = namespace["_RUNNER"]
+
+        with pytest.raises(AssertionError):
+            namespace["_run_doctests"](
+                "pkg/bad", lambda x: x, {"func_name": "f", "docstring": ">>> f(1)\n2"}
+            )
+        namespace["_run_doctests"](
+            "pkg/good", lambda x: x, {"func_name": "f", "docstring": ">>> f(1)\n1"}
+        )
+
+        assert namespace["_RUNNER"] is runner
+
+    def test_harness_runner_uses_preparsed_examples(self):
+        """Cases carry parsed examples, so the harness never re-parses the docstring."""
+        import doctest
+        import json
+
+        from vibesafe.testing import _HARNESS_RUNNER, _example_fields
+
+        namespace: dict = {"__file__": "/nonexistent/test_vibesafe_harness.py"}
+        exec(compile(_HARNESS_RUNNER, "<harness>", "exec"), namespace)
+        namespace["_PARSER"] = None  # any parse attempt would raise
+
+        docstring = ">>> double(3)  # doctest: +NORMALIZE_WHITESPACE\n6"
+        examples = _example_fields(doctest.DocTestParser().get_examples(docstring))
+        meta = json.loads(
+            json.dumps({"func_name": "double", "docstring": docstring, "examples": examples})
+        )
+
+        namespace["_run_doctests"]("pkg/double", lambda x: x * 2, meta)
+        (rebuilt,) = namespace["_examples"](meta)
+        assert rebuilt.options == {doctest.NORMALIZE_WHITESPACE: True}
+
+    def test_nested_use_gets_private_runner(self):
+        """Re-entering while the shared runner is busy falls back to a fresh one."""
+        from vibesafe.testing import _doctest_runner
+
+        with _doctest_runner() as outer, _doctest_runner() as inner:
+            assert outer is not inner
+
+
+class TestQualityGates:
+    """Tests for the lint/type-check gate runner."""
+
+    @pytest.fixture(autouse=True)
+    def _fixed_tool_versions(self, monkeypatch):
+        from vibesafe import testing
+
+        monkeypatch.setattr(testing, "_gate_tool_versions", lambda: ("ruff 1", "ty 1"))
+
+    def test_passing_gates_are_cached_by_content(self, checkpoint_dir, test_config, monkeypatch):
+        """A second run on unchanged code skips the gate subprocesses."""
+        import subprocess
+
+        from vibesafe.testing import _run_quality_gates
+
+        calls: list[list[str]] = []
+
+        def fake_run(cmd, **kwargs):
+            calls.append(cmd)
+            return subprocess.CompletedProcess(cmd, 0, "", "")
+
+        monkeypatch.setattr("vibesafe.testing.subprocess.run", fake_run)
+
+        impl_path = checkpoint_dir / "impl.py"
+        impl_path.write_text("def func() -> int:\n    return 1\n")
+
+        assert _run_quality_gates(impl_path, test_config) == []
+        assert len(calls) == 2
+
+        assert _run_quality_gates(impl_path, test_config) == []
+        assert len(calls) == 2
+
+        impl_path.write_text("def func() -> int:\n    return 2\n")
+        assert _run_quality_gates(impl_path, test_config) == []
+        assert len(calls) == 4
+
+        assert not (checkpoint_dir / ".gates").exists()
+        assert (
+            len(list((test_config.resolve_path(test_config.paths.cache) / "gates").iterdir())) == 2
+        )
+
+    def test_gate_cache_keyed_on_tools_and_config(
+        self, checkpoint_dir, temp_dir, test_config, monkeypatch
+    ):
+        """Upgrading a gate tool or editing its config re-runs the gates."""
+        import subprocess
+
+        from vibesafe import testing
+
+        calls: list[list[str]] = []
+
+        def fake_run(cmd, **kwargs):
+            calls.append(cmd)
+            return subprocess.CompletedProcess(cmd, 0, "", "")
+
+        monkeypatch.setattr("vibesafe.testing.subprocess.run", fake_run)
+
+        impl_path = checkpoint_dir / "impl.py"
+        impl_path.write_text("def func() -> int:\n    return 1\n")
+
+        assert testing._run_quality_gates(impl_path, test_config) == []
+        assert len(calls) == 2
+
+        monkeypatch.setattr(testing, "_gate_tool_versions", lambda: ("ruff 2", "ty 1"))
+        assert testing._run_quality_gates(impl_path, test_config) == []
+        assert len(calls) == 4
+
+        (temp_dir / "ruff.toml").write_text("line-length = 80\n")
+        assert testing._run_quality_gates(impl_path, test_config) == []
+        assert len(calls) == 6
+
+        assert testing._run_quality_gates(impl_path, test_config) == []
+        assert len(calls) == 6
+
+    def test_gate_executable_follows_path(self, temp_dir, monkeypatch):
+        """Tools are resolved against the current PATH; a missing tool is looked up again."""
+        from vibesafe import testing
+
+        monkeypatch.setattr(testing, "_GATE_EXECUTABLES", {})
+        first, second = temp_dir / "first", temp_dir / "second"
+        for directory in (first, second):
+            directory.mkdir()
+        tool = "vibesafe-fake-gate"
+
+        monkeypatch.setenv("PATH", str(first))
+        assert testing._gate_executable(tool) == tool
+
+        (first / tool).write_text("#!/bin/sh\n")
+        (first / tool).chmod(0o755)
+        assert testing._gate_executable(tool) == str(first / tool)
+
+        (second / tool).write_text("#!/bin/sh\n")
+        (second / tool).chmod(0o755)
+        monkeypatch.setenv("PATH", str(second))
+        assert testing._gate_executable(tool) == str(second / tool)
+
+    def test_failing_gates_are_not_cached(self, checkpoint_dir, test_config, monkeypatch):
+        """Gate failures are re-checked on every run."""
+        import subprocess
+
+        from vibesafe.testing import _run_quality_gates
+
+        calls: list[list[str]] = []
+
+        def fake_run(cmd, **kwargs):
+            calls.append(cmd)
+            return subprocess.CompletedProcess(cmd, 1, "", "boom")
+
+        monkeypatch.setattr("vibesafe.testing.subprocess.run", fake_run)
+
+        impl_path = checkpoint_dir / "impl.py"
+        impl_path.write_text("def func() -> int:\n    return 1\n")
+
+        errors = ["ruff failed: boom", "ty failed: boom"]
+        assert _run_quality_gates(impl_path, test_config) == errors
+        assert _run_quality_gates(impl_path, test_config) == errors
+        assert len(calls) == 4
+        assert not (test_config.resolve_path(test_config.paths.cache) / "gates").exists()
+
+    def test_batched_gates_attribute_failures_per_file(self, temp_dir, test_config, monkeypatch):
+        """One invocation per gate covers every file; diagnostics land on their own file."""
+        import json
+        import subprocess
+
+        from vibesafe import testing
+        from vibesafe.testing import _run_quality_gates_batched
+
+        good = temp_dir / "good" / "impl.py"
+        bad = temp_dir / "bad" / "impl.py"
+        for value, path in enumerate((good, bad)):
+            path.parent.mkdir()
+            path.write_text(f"def func() -> int:\n    return {value}\n")
+
+        calls: list[list[str]] = []
+
+        def fake_run(cmd, **kwargs):
+            calls.append(cmd)
+            if cmd[0] == "ruff":
+                diag = {
+                    "filename": str(bad),
+                    "code": "F821",
+                    "message": "Undefined name `y`",
+                    "location": {"row": 2, "column": 12},
+                }
+                return subprocess.CompletedProcess(cmd, 1, json.dumps([diag]), "")
+            return subprocess.CompletedProcess(cmd, 0, "", "")
+
+        monkeypatch.setattr("vibesafe.testing.subprocess.run", fake_run)
+
+        results = _run_quality_gates_batched([good, bad], test_config)
+
+        assert len(calls) == 2
+        assert all(str(good) in cmd and str(bad) in cmd for cmd in calls)
+        assert results[good] == []
+        assert results[bad] == ["ruff failed: impl.py:2:12: F821 Undefined name `y`"]
+        assert testing._gate_marker(good, test_config).exists()
+        assert not testing._gate_marker(bad, test_config).exists()
+
+
+class TestSandbox:
+    """Tests for the sandboxed doctest runner."""
+
+    def _install_checkpoint(self, temp_dir, unit_id: str, impl: str) -> Path:
+        from vibesafe.runtime import update_index
+
+        active_hash = "a" * 64
+        checkpoint = (
+            temp_dir / ".vibesafe" / "checkpoints" / unit_id.replace(".", "/") / active_hash[:16]
+        )
+        checkpoint.mkdir(parents=True, exist_ok=True)
+        impl_path = checkpoint / "impl.py"
+        impl_path.write_text(impl)
+        update_index(unit_id, active_hash)
+        return impl_path
+
+    def test_sandbox_roundtrip(self, temp_dir, test_config, monkeypatch):
+        """Payload and results survive the worker boundary even if the impl prints."""
+        from vibesafe import config as config_module
+        from vibesafe import testing
+
+        monkeypatch.chdir(temp_dir)
+        config_module._config = test_config
+        self._install_checkpoint(
+            temp_dir,
+            "sandbox.mod/echo",
+            'print("noise")\n\ndef echo(msg: str) -> str:\n    return msg\n',
+        )
+
+        unit_key = testing._UnitKey("sandbox.mod/echo", "echo")
+        spec = {"docstring": ">>> echo('hi')\n'hi'", "hypothesis_blocks": []}
+
+        try:
+            result = testing._run_sandbox_checks(unit_key, spec, test_config.sandbox)
+        finally:
+            testing.shutdown_sandbox()
+        assert result.passed, result.errors
+        assert result.total == 1
+
+    def test_sandbox_result_channel_unreachable_from_impl(self, temp_dir, test_config, monkeypatch):
+        """Bytes the impl writes to fd 1 are neither unpickled nor mistaken for a result."""
+        from vibesafe import config as config_module
+        from vibesafe import testing
+
+        monkeypatch.chdir(temp_dir)
+        config_module._config = test_config
+        marker = temp_dir / "pwned.txt"
+        self._install_checkpoint(
+            temp_dir,
+            "sandbox.mod/sneak",
+            "import os\nimport pickle\n\n"
+            "class Payload:\n"
+            "    def __reduce__(self):\n"
+            f"        return (open, ({str(marker)!r}, 'w'))\n\n"
+            "def sneak() -> int:\n"
+            "    os.write(1, pickle.dumps(Payload()))\n"
+            "    os.write(1, b'raw bytes, no newline')\n"
+            "    return 1\n",
+        )
+        unit_key = testing._UnitKey("sandbox.mod/sneak", "sneak")
+        spec = {"docstring": ">>> sneak()\n1", "hypothesis_blocks": []}
+
+        try:
+            result = testing._run_sandbox_checks(unit_key, spec, test_config.sandbox)
+        finally:
+            testing.shutdown_sandbox()
+
+        assert result.passed, result.errors
+        assert not marker.exists()
+
+    @pytest.mark.parametrize(
+        "data",
+        [None, "passed", ["x"], {"failures": "x"}, {"failures": [1]}, {"total": "1"}],
+        ids=["none", "str", "list", "failures-str", "failures-int", "total-str"],
+    )
+    def test_malformed_sandbox_result_fails(self, data):
+        """A worker result of the wrong shape fails the unit instead of raising."""
+        from vibesafe.testing import _sandbox_result
+
+        result = _sandbox_result(data)
+        assert not result.passed
+        assert result.errors == ["Sandbox returned a malformed result"]
+
+    def test_sandbox_properties_run_under_stable_module_name(
+        self, temp_dir, test_config, monkeypatch
+    ):
+        """Property blocks in the worker get the same module naming as inline runs."""
+        from vibesafe import config as config_module
+        from vibesafe import testing
+
+        monkeypatch.chdir(temp_dir)
+        config_module._config = test_config
+        self._install_checkpoint(
+            temp_dir, "sandbox.mod/echo", "def echo(msg: str) -> str:\n    return msg\n"
+        )
+        block = (
+            "from hypothesis import given, strategies as st\n\n"
+            "@given(st.integers())\n"
+            "def test_echo(n):\n"
+            "    assert func(str(n)) == str(n)\n"
+            "    assert test_echo.__module__ == 'vibesafe._props.sandbox_mod_echo'\n"
+        )
+        spec = {"docstring": "", "hypothesis_blocks": [block]}
+
+        try:
+            result = testing._run_sandbox_checks(
+                testing._UnitKey("sandbox.mod/echo", "echo"), spec, test_config.sandbox
+            )
+        finally:
+            testing.shutdown_sandbox()
+        assert result.passed, result.errors
+        assert result.total == 1
+
+    def test_sandbox_reports_doctest_failure(self, temp_dir, test_config, monkeypatch):
+        """Doctest failures inside the sandbox carry the runner report back."""
+        from vibesafe import config as config_module
+        from vibesafe import testing
+
+        monkeypatch.chdir(temp_dir)
+        config_module._config = test_config
+        self._install_checkpoint(
+            temp_dir,
+            "sandbox.mod/shout",
+            "def shout(msg: str) -> str:\n    return msg\n",
+        )
+
+        unit_key = testing._UnitKey("sandbox.mod/shout", "shout")
+        spec = {"docstring": ">>> shout('hi')\n'HI'", "hypothesis_blocks": []}
+
+        try:
+            result = testing._run_sandbox_checks(unit_key, spec, test_config.sandbox)
+        finally:
+            testing.shutdown_sandbox()
+        assert not result.passed
+        assert "1 doctest(s) failed" in result.errors[0]
+        assert "'HI'" in result.errors[0]
+
+    def test_sandbox_worker_reuses_loaded_impl_until_it_changes(
+        self, temp_dir, test_config, monkeypatch
+    ):
+        """The worker re-executes an implementation only after its file changes."""
+        from vibesafe import config as config_module
+        from vibesafe import testing
+
+        monkeypatch.chdir(temp_dir)
+        config_module._config = test_config
+        loads = temp_dir / "loads.txt"
+        impl = (
+            f"open({str(loads)!r}, 'a').write('x')\n\ndef echo(msg: str) -> str:\n    return msg\n"
+        )
+        impl_path = self._install_checkpoint(temp_dir, "sandbox.mod/echo", impl)
+        unit_key = testing._UnitKey("sandbox.mod/echo", "echo")
+        spec = {"docstring": ">>> echo('hi')\n'hi'", "hypothesis_blocks": []}
+
+        try:
+            for _ in range(3):
+                result = testing._run_sandbox_checks(unit_key, spec, test_config.sandbox, impl_path)
+                assert result.passed, result.errors
+            assert loads.read_text() == "x"
+
+            impl_path.write_text(impl + "\n# edited\n")
+            assert testing._run_sandbox_checks(
+                unit_key, spec, test_config.sandbox, impl_path
+            ).passed
+            assert loads.read_text() == "xx"
+        finally:
+            testing.shutdown_sandbox()
+
+    def test_sandbox_worker_is_reused_and_replaced_after_timeout(
+        self, temp_dir, test_config, monkeypatch
+    ):
+        """Consecutive checks share one worker; a timeout kills it and the next check respawns."""
+        from vibesafe import config as config_module
+        from vibesafe import testing
+
+        monkeypatch.chdir(temp_dir)
+        config_module._config = test_config
+        test_config.sandbox.timeout = 2
+        self._install_checkpoint(
+            temp_dir,
+            "sandbox.mod/nap",
+            "import time\n\ndef nap(s: float) -> float:\n    time.sleep(s)\n    return s\n",
+        )
+        unit_key = testing._UnitKey("sandbox.mod/nap", "nap")
+        quick = {"docstring": ">>> nap(0)\n0", "hypothesis_blocks": []}
+        slow = {"docstring": ">>> nap(30)\n30", "hypothesis_blocks": []}
+
+        try:
+            assert testing._run_sandbox_checks(unit_key, quick, test_config.sandbox).passed
+            worker = testing._current_sandbox_worker()
+            assert testing._run_sandbox_checks(unit_key, quick, test_config.sandbox).passed
+            assert testing._current_sandbox_worker() is worker
+
+            timed_out = testing._run_sandbox_checks(unit_key, slow, test_config.sandbox)
+            assert timed_out.errors == ["Sandbox timed out"]
+            assert testing._current_sandbox_worker() is None
+
+            assert testing._run_sandbox_checks(unit_key, quick, test_config.sandbox).passed
+            assert testing._current_sandbox_worker() is not worker
+        finally:
+            testing.shutdown_sandbox()
+
+    def test_each_thread_gets_its_own_worker(self, temp_dir, test_config, monkeypatch):
+        """Concurrent callers do not share a worker; shutdown_sandbox stops them all."""
+        import threading
+
+        from vibesafe import config as config_module
+        from vibesafe import testing
+
+        monkeypatch.chdir(temp_dir)
+        config_module._config = test_config
+        test_config.sandbox.memory_mb = 0
+        self._install_checkpoint(
+            temp_dir, "sandbox.mod/echo", "def echo(msg: str) -> str:\n    return msg\n"
+        )
+        unit_key = testing._UnitKey("sandbox.mod/echo", "echo")
+        spec = {"docstring": ">>> echo('hi')\n'hi'", "hypothesis_blocks": []}
+        workers = {}
+
+        def check(name):
+            assert testing._run_sandbox_checks(unit_key, spec, test_config.sandbox).passed
+            workers[name] = testing._current_sandbox_worker()
+
+        try:
+            check("main")
+            thread = threading.Thread(target=check, args=("other",))
+            thread.start()
+            thread.join()
+            assert workers["main"] is not workers["other"]
+            assert all(worker.process.poll() is None for worker in workers.values())
+        finally:
+            testing.shutdown_sandbox()
+
+        assert all(worker.process.poll() is not None for worker in workers.values())
+        assert testing._current_sandbox_worker() is None
+
+    def test_sandbox_worker_crash_reports_stderr(self, temp_dir, test_config, monkeypatch):
+        """A worker that dies mid-check reports its exit code and stderr output."""
+        from vibesafe import config as config_module
+        from vibesafe import testing
+
+        monkeypatch.chdir(temp_dir)
+        config_module._config = test_config
+        self._install_checkpoint(
+            temp_dir,
+            "sandbox.mod/crash",
+            "import os\n\ndef crash() -> None:\n"
+            "    os.write(2, b'fatal: worker state corrupted')\n"
+            "    os._exit(3)\n",
+        )
+        unit_key = testing._UnitKey("sandbox.mod/crash", "crash")
+        spec = {"docstring": ">>> crash()", "hypothesis_blocks": []}
+
+        try:
+            result = testing._run_sandbox_checks(unit_key, spec, test_config.sandbox)
+        finally:
+            testing.shutdown_sandbox()
+
+        assert not result.passed
+        assert "exit code 3" in result.errors[0]
+        assert "fatal: worker state corrupted" in result.errors[0]
+
+    def test_memory_limited_worker_serves_one_unit(self, temp_dir, test_config, monkeypatch):
+        """Under a memory limit each unit gets its own worker; without one they share."""
+        from vibesafe import config as config_module
+        from vibesafe import testing
+
+        monkeypatch.chdir(temp_dir)
+        config_module._config = test_config
+        for name in ("one", "two"):
+            self._install_checkpoint(
+                temp_dir, f"sandbox.mod/{name}", f"def {name}() -> int:\n    return 1\n"
+            )
+        spec_for = {
+            name: {"docstring": f">>> {name}()\n1", "hypothesis_blocks": []}
+            for name in ("one", "two")
+        }
+
+        def workers_used(memory_mb):
+            test_config.sandbox.memory_mb = memory_mb
+            used = []
+            try:
+                for name in ("one", "one", "two"):
+                    key = testing._UnitKey(f"sandbox.mod/{name}", name)
+                    assert testing._run_sandbox_checks(
+                        key, spec_for[name], test_config.sandbox
+                    ).passed
+                    used.append(testing._current_sandbox_worker())
+            finally:
+                testing.shutdown_sandbox()
+            return used
+
+        limited = workers_used(256)
+        assert limited[0] is limited[1]
+        assert limited[2] is not limited[1]
+
+        shared = workers_used(0)
+        assert shared[0] is shared[1] is shared[2]
+
+
 class TestTestUnit:
     """Tests for test_unit function."""
 
@@ -277,3 +1117,366 @@ class TestTestUnit:
         unit_id = uncompiled_func.__vibesafe_unit_id__
         result = test_unit(unit_id)
         assert not result.passed
+
+    def test_unit_uses_passed_config(
+        self, test_config, temp_dir, monkeypatch, clear_vibesafe_registry
+    ):
+        """An explicit config is threaded through without consulting the global one."""
+        from vibesafe import testing
+
+        @vibesafe
+        def uncompiled_func(x: int) -> int:
+            """Not compiled."""
+            raise VibeCoded()
+
+        monkeypatch.chdir(temp_dir)
+
+        def no_global_config(*args, **kwargs):
+            raise AssertionError("get_config should not be called")
+
+        monkeypatch.setattr(testing, "get_config", no_global_config)
+
+        result = test_unit(uncompiled_func.__vibesafe_unit_id__, config=test_config)
+        assert "No index file found" in result.errors[0]
+
+    def test_index_parsed_once_until_it_changes(self, test_config, temp_dir, monkeypatch):
+        """The index TOML is re-parsed only after the file is rewritten."""
+        from vibesafe import testing
+        from vibesafe.runtime import update_index
+
+        monkeypatch.chdir(temp_dir)
+        monkeypatch.setattr(testing, "_INDEX_CACHE", {})
+        parses: list[object] = []
+        real_load = testing.tomllib.load
+        monkeypatch.setattr(testing.tomllib, "load", lambda f: parses.append(f) or real_load(f))
+
+        update_index("pkg.mod/first", "a" * 64)
+        parses.clear()
+        first = testing._load_index(test_config)
+        again = testing._load_index(test_config)
+        assert again is first
+        assert len(parses) == 1
+
+        update_index("pkg.mod/second", "b" * 64)
+        parses.clear()
+        updated = testing._load_index(test_config)
+        assert len(parses) == 1
+        assert "pkg.mod/second" in updated
+
+
+class TestRunAllTests:
+    """Tests for run_all_tests."""
+
+    def test_resolves_every_unit_from_one_index_read(
+        self, test_config, temp_dir, monkeypatch, clear_vibesafe_registry
+    ):
+        """Compiled, unindexed and impl-less units each get the right result."""
+        from vibesafe import config as config_module
+        from vibesafe.runtime import update_index
+        from vibesafe.testing import run_all_tests
+
+        monkeypatch.chdir(temp_dir)
+        config_module._config = test_config
+        monkeypatch.setattr(
+            "vibesafe.testing._run_quality_gates_batched",
+            lambda paths, config=None: {path: [] for path in paths},
+        )
+
+        @vibesafe
+        def compiled(x: int) -> int:
+            """
+            Identity.
+
+            >>> compiled(3)
+            3
+            """
+            raise VibeCoded()
+
+        @vibesafe
+        def unindexed(x: int) -> int:
+            """Never compiled."""
+            raise VibeCoded()
+
+        @vibesafe
+        def hollow(x: int) -> int:
+            """Indexed but missing its impl."""
+            raise VibeCoded()
+
+        checkpoints = temp_dir / ".vibesafe" / "checkpoints"
+        compiled_id = compiled.__vibesafe_unit_id__
+        compiled_dir = checkpoints / compiled_id.replace(".", "/") / ("a" * 16)
+        compiled_dir.mkdir(parents=True)
+        (compiled_dir / "impl.py").write_text("def compiled(x: int) -> int:\n    return x\n")
+        update_index(compiled_id, "a" * 64)
+        update_index(hollow.__vibesafe_unit_id__, "b" * 64)
+
+        results = run_all_tests()
+
+        assert results[compiled_id].passed
+        assert results[compiled_id].total == 1
+        assert "Unit not in index" in results[unindexed.__vibesafe_unit_id__].errors[0]
+        assert "Implementation file not found" in results[hollow.__vibesafe_unit_id__].errors[0]
+
+    def test_units_checked_in_parallel_keep_registry_order(
+        self, test_config, temp_dir, monkeypatch, clear_vibesafe_registry
+    ):
+        """Fanning out across workers still yields one ordered result per unit."""
+        from vibesafe import config as config_module
+        from vibesafe.runtime import update_index
+        from vibesafe.testing import run_all_tests
+
+        monkeypatch.chdir(temp_dir)
+        config_module._config = test_config
+        monkeypatch.setattr(
+            "vibesafe.testing._run_quality_gates_batched",
+            lambda paths, config=None: {path: [] for path in paths},
+        )
+
+        @vibesafe
+        def first(x: int) -> int:
+            """
+            >>> first(1)
+            1
+            """
+            raise VibeCoded()
+
+        @vibesafe
+        def second(x: int) -> int:
+            """
+            >>> second(1)
+            2
+            """
+            raise VibeCoded()
+
+        @vibesafe
+        def third(x: int) -> int:
+            """
+            >>> third(2)
+            2
+            """
+            raise VibeCoded()
+
+        checkpoints = temp_dir / ".vibesafe" / "checkpoints"
+        for func in (first, second, third):
+            unit_id = func.__vibesafe_unit_id__
+            checkpoint = checkpoints / unit_id.replace(".", "/") / ("c" * 16)
+            checkpoint.mkdir(parents=True)
+            (checkpoint / "impl.py").write_text(
+                f"def {func.__name__}(x: int) -> int:\n    return x\n"
+            )
+            update_index(unit_id, "c" * 64)
+
+        results = run_all_tests(workers=3)
+
+        assert list(results) == [f.__vibesafe_unit_id__ for f in (first, second, third)]
+        assert results[first.__vibesafe_unit_id__].passed
+        assert not results[second.__vibesafe_unit_id__].passed
+        assert results[third.__vibesafe_unit_id__].passed
+
+    def test_units_checked_in_process_by_default(self, test_config, monkeypatch):
+        """Without an explicit worker count no process pool is started."""
+        from vibesafe import testing
+
+        def no_pool(*args, **kwargs):
+            raise AssertionError("process pool should not start")
+
+        monkeypatch.setattr(testing, "ProcessPoolExecutor", no_pool)
+
+        results = testing._check_units(
+            {"missing/a": Path("a.py"), "missing/b": Path("b.py")}, test_config
+        )
+
+        assert set(results) == {"missing/a", "missing/b"}
+        assert all("Unit not found" in r.errors[0] for r in results.values())
+
+    def test_units_checked_with_the_callers_config(
+        self, test_config, temp_dir, monkeypatch, clear_vibesafe_registry
+    ):
+        """The config handed to _check_units reaches every unit's checks without a reload."""
+        from vibesafe import testing
+
+        @vibesafe
+        def same(x: int) -> int:
+            """
+            >>> same(1)
+            1
+            """
+            raise VibeCoded()
+
+        impl_path = temp_dir / "impl.py"
+        impl_path.write_text("def same(x: int) -> int:\n    return x\n")
+
+        def no_reload(*args, **kwargs):
+            raise AssertionError("get_config should not be called per unit")
+
+        monkeypatch.setattr(testing, "get_config", no_reload)
+
+        results = testing._check_units({same.__vibesafe_unit_id__: impl_path}, test_config)
+
+        assert results[same.__vibesafe_unit_id__].passed
+
+    def test_sandboxed_units_share_one_request(
+        self, test_config, temp_dir, monkeypatch, clear_vibesafe_registry
+    ):
+        """With the sandbox on and no memory limit, all units go to the worker in one batch."""
+        from vibesafe import config as config_module
+        from vibesafe import testing
+        from vibesafe.runtime import update_index
+
+        monkeypatch.chdir(temp_dir)
+        config_module._config = test_config
+        test_config.sandbox.enabled = True
+        test_config.sandbox.memory_mb = 0
+        monkeypatch.setattr(
+            "vibesafe.testing._run_quality_gates_batched",
+            lambda paths, config=None: {path: [] for path in paths},
+        )
+
+        requests = []
+        real_request = testing._request_sandbox
+
+        def counting_request(payload, sandbox_cfg, timeout):
+            requests.append(payload)
+            return real_request(payload, sandbox_cfg, timeout)
+
+        monkeypatch.setattr(testing, "_request_sandbox", counting_request)
+
+        @vibesafe
+        def ok(x: int) -> int:
+            """
+            >>> ok(1)
+            1
+            """
+            raise VibeCoded()
+
+        @vibesafe
+        def wrong(x: int) -> int:
+            """
+            >>> wrong(1)
+            2
+            """
+            raise VibeCoded()
+
+        checkpoints = temp_dir / ".vibesafe" / "checkpoints"
+        for func in (ok, wrong):
+            unit_id = func.__vibesafe_unit_id__
+            checkpoint = checkpoints / unit_id.replace(".", "/") / ("d" * 16)
+            checkpoint.mkdir(parents=True)
+            (checkpoint / "impl.py").write_text(
+                f"def {func.__name__}(x: int) -> int:\n    return x\n"
+            )
+            update_index(unit_id, "d" * 64)
+
+        results = testing.run_all_tests()
+
+        assert len(requests) == 1
+        assert isinstance(requests[0], list) and len(requests[0]) == 2
+        assert results[ok.__vibesafe_unit_id__].passed
+        assert not results[wrong.__vibesafe_unit_id__].passed
+        assert testing._current_sandbox_worker() is None
+
+    def test_gate_batch_failure_falls_back_to_per_unit_gates(
+        self, test_config, temp_dir, monkeypatch, clear_vibesafe_registry
+    ):
+        """A batch that raises is retried per unit; only the broken unit reports an error."""
+        from vibesafe import config as config_module
+        from vibesafe import testing
+        from vibesafe.runtime import update_index
+
+        monkeypatch.chdir(temp_dir)
+        config_module._config = test_config
+
+        @vibesafe
+        def fine(x: int) -> int:
+            """
+            >>> fine(1)
+            1
+            """
+            raise VibeCoded()
+
+        @vibesafe
+        def broken(x: int) -> int:
+            """
+            >>> broken(1)
+            1
+            """
+            raise VibeCoded()
+
+        checkpoints = temp_dir / ".vibesafe" / "checkpoints"
+        for func in (fine, broken):
+            unit_id = func.__vibesafe_unit_id__
+            checkpoint = checkpoints / unit_id.replace(".", "/") / ("f" * 16)
+            checkpoint.mkdir(parents=True)
+            (checkpoint / "impl.py").write_text(
+                f"def {func.__name__}(x: int) -> int:\n    return x\n"
+            )
+            update_index(unit_id, "f" * 64)
+
+        def failing_batch(paths, config=None):
+            raise ValueError("Paths don't have the same drive")
+
+        def per_unit(path, config=None):
+            if "broken" in str(path):
+                raise OSError("impl.py vanished")
+            return []
+
+        monkeypatch.setattr(testing, "_run_quality_gates_batched", failing_batch)
+        monkeypatch.setattr(testing, "_run_quality_gates", per_unit)
+
+        results = testing.run_all_tests()
+
+        assert results[fine.__vibesafe_unit_id__].passed
+        assert results[broken.__vibesafe_unit_id__].errors == [
+            "Error testing unit: impl.py vanished"
+        ]
+
+    def test_sandbox_spawn_failure_fails_each_unit(
+        self, test_config, temp_dir, monkeypatch, clear_vibesafe_registry
+    ):
+        """A worker that cannot start fails every sandboxed unit instead of the whole run."""
+        from vibesafe import config as config_module
+        from vibesafe import testing
+        from vibesafe.runtime import update_index
+
+        monkeypatch.chdir(temp_dir)
+        config_module._config = test_config
+        test_config.sandbox.enabled = True
+        test_config.sandbox.memory_mb = 0
+
+        def no_spawn(*args, **kwargs):
+            raise OSError("Too many open files")
+
+        monkeypatch.setattr(testing.subprocess, "Popen", no_spawn)
+
+        @vibesafe
+        def left(x: int) -> int:
+            """
+            >>> left(1)
+            1
+            """
+            raise VibeCoded()
+
+        @vibesafe
+        def right(x: int) -> int:
+            """
+            >>> right(1)
+            1
+            """
+            raise VibeCoded()
+
+        checkpoints = temp_dir / ".vibesafe" / "checkpoints"
+        for func in (left, right):
+            unit_id = func.__vibesafe_unit_id__
+            checkpoint = checkpoints / unit_id.replace(".", "/") / ("c" * 16)
+            checkpoint.mkdir(parents=True)
+            (checkpoint / "impl.py").write_text(
+                f"def {func.__name__}(x: int) -> int:\n    return x\n"
+            )
+            update_index(unit_id, "c" * 64)
+
+        results = testing.run_all_tests()
+
+        for func in (left, right):
+            result = results[func.__vibesafe_unit_id__]
+            assert not result.passed
+            assert result.errors == ["Failed to start sandbox worker: Too many open files"]